@@ -0,0 +1,410 @@
+"""Relay one Gladia live session to any number of OBS subtitle overlays.
+
+The relay captures the microphone once, transcribes it with a single live session and serves
+`subtitles-relay.html`, which OBS browser sources load from http://localhost:8765/. Each
+overlay may ask for its own `target_language`: finals are translated once per line and target
+language, then shared by every overlay showing that language.
+
+Every overlay has its own writer: partials are coalesced (an overlay only ever gets the latest
+one) and finals queue up to a limit, so a slow or frozen browser source only delays itself.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+from gladiaio_sdk import (
+    GladiaClient,
+    LiveV2AsyncClient,
+    LiveV2AsyncSession,
+    LiveV2EndedMessage,
+    LiveV2InitRequest,
+    LiveV2InitResponse,
+    LiveV2LanguageConfig,
+    LiveV2MessagesConfig,
+    LiveV2WebSocketMessage,
+)
+from websockets.asyncio.server import ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+from websockets.http11 import Request, Response
+
+logger = logging.getLogger("obs-relay")
+
+SAMPLE_RATE = 16_000
+BIT_DEPTH = 16
+CHANNELS = 1
+FRAMES_PER_BUFFER = 3200
+
+CAPTIONS_PATH = "/captions"
+OVERLAY_PATH = Path(__file__).with_name("subtitles-relay.html")
+
+TRANSLATE_URL = "https://subtitles.gladia.io/translate"
+TRANSLATION_TIMEOUT = 5.0
+TRANSLATION_CACHE_SIZE = 1000
+# Finals an overlay may fall behind by before its oldest ones are dropped
+MAX_PENDING_FINALS = 20
+
+# Overlays use language names, like the `source_language` of subtitles-with-chromakey.html
+LANGUAGE_CODES = {
+    "arabic": "ar",
+    "chinese": "zh",
+    "dutch": "nl",
+    "english": "en",
+    "french": "fr",
+    "german": "de",
+    "hindi": "hi",
+    "italian": "it",
+    "japanese": "ja",
+    "korean": "ko",
+    "polish": "pl",
+    "portuguese": "pt",
+    "russian": "ru",
+    "spanish": "es",
+    "turkish": "tr",
+}
+
+
+@dataclass(frozen=True)
+class Caption:
+    # Increases with every final; partials carry the line their final will replace
+    line: int
+    is_final: bool
+    text: str
+
+
+class TranslationCache:
+    """Translate each line once per target language, however many overlays show it."""
+
+    def __init__(self, source_language: str) -> None:
+        self._source_language = source_language
+        self._http = httpx.AsyncClient(timeout=TRANSLATION_TIMEOUT)
+        # Pending translations are cached too, so concurrent requests for a line share one call
+        self._entries: OrderedDict[tuple[str, str], asyncio.Future[str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def translate(self, text: str, target_language: str) -> asyncio.Future[str]:
+        key = (text, target_language)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        future = asyncio.ensure_future(self._fetch(text, target_language))
+        future.add_done_callback(lambda f: self._forget_failure(key, f))
+        self._entries[key] = future
+        if len(self._entries) > TRANSLATION_CACHE_SIZE:
+            self._entries.popitem(last=False)
+        return future
+
+    def _forget_failure(self, key: tuple[str, str], future: asyncio.Future[str]) -> None:
+        # Failed translations are retried the next time the line is shown
+        if not future.cancelled() and future.exception() and self._entries.get(key) is future:
+            del self._entries[key]
+
+    async def _fetch(self, text: str, target_language: str) -> str:
+        response = await self._http.post(
+            TRANSLATE_URL,
+            json={
+                "source_lang": self._source_language.capitalize(),
+                "target_lang": target_language.capitalize(),
+                "text": [text],
+            },
+        )
+        response.raise_for_status()
+        return str(response.json()[0])
+
+    async def close(self) -> None:
+        await self._http.aclose()
+
+
+class Overlay:
+    """One connected browser source, with the captions it has not received yet."""
+
+    def __init__(self, websocket: ServerConnection, target_language: str | None) -> None:
+        self.websocket = websocket
+        self.target_language = target_language
+        self.partial: Caption | None = None
+        self.finals: deque[tuple[Caption, asyncio.Future[str] | None]] = deque()
+        self.sent = 0
+        self.dropped = 0
+        self._wakeup = asyncio.Event()
+        # Set while every caption pushed so far has been sent
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    def push(self, caption: Caption, translation: asyncio.Future[str] | None = None) -> None:
+        if caption.is_final:
+            # The final replaces the partial of its line, whether it was sent or not
+            self.partial = None
+            self.finals.append((caption, translation))
+            if len(self.finals) > MAX_PENDING_FINALS:
+                self.finals.popleft()
+                self.dropped += 1
+        else:
+            self.partial = caption
+        self.idle.clear()
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self.finals or self.partial:
+                    if self.finals:
+                        caption, translation = self.finals.popleft()
+                        text = await self._translated(caption, translation)
+                    else:
+                        caption, self.partial = self.partial, None
+                        text = caption.text
+                    # Only this overlay's writer waits when its browser is slow to read
+                    await self.websocket.send(
+                        json.dumps({"line": caption.line, "final": caption.is_final, "text": text})
+                    )
+                    self.sent += 1
+                self.idle.set()
+        except ConnectionClosed:
+            self.idle.set()
+
+    async def _translated(self, caption: Caption, translation: asyncio.Future[str] | None) -> str:
+        if translation is None:
+            return caption.text
+        try:
+            # Shielded: the translation is shared with the other overlays of this language
+            return await asyncio.wait_for(asyncio.shield(translation), TRANSLATION_TIMEOUT)
+        except Exception as err:
+            logger.warning(
+                f"Translation to {self.target_language} failed, showing the original: {err!r}"
+            )
+            return caption.text
+
+
+class CaptionRelay:
+    def __init__(self, source_language: str | None, translations: TranslationCache | None) -> None:
+        self.source_language = source_language
+        self.translations = translations
+        self.overlays: set[Overlay] = set()
+        self._line = 0
+
+    def publish(self, text: str, is_final: bool) -> None:
+        caption = Caption(self._line, is_final, text)
+        if is_final:
+            self._line += 1
+
+        translations: dict[str, asyncio.Future[str]] = {}
+        for overlay in self.overlays:
+            target = overlay.target_language
+            if self.translations is None or target in (None, self.source_language):
+                overlay.push(caption)
+            elif is_final:
+                # Partials change too often to be worth translating: translated overlays only
+                # get finals
+                if target not in translations:
+                    translations[target] = self.translations.translate(text, target)
+                overlay.push(caption, translations[target])
+
+    async def flush(self, timeout: float) -> None:
+        """Give every overlay a chance to receive the last captions before the relay stops."""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(overlay.idle.wait() for overlay in self.overlays)), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Some overlays did not receive the last captions")
+
+    async def handle(self, websocket: ServerConnection) -> None:
+        query = parse_qs(urlsplit(websocket.request.path).query)
+        target_language = query.get("target_language", [None])[0]
+        overlay = Overlay(websocket, target_language.lower() if target_language else None)
+        self.overlays.add(overlay)
+        logger.info(f"Overlay connected ({len(self.overlays)} total), language: {target_language}")
+        writer = asyncio.create_task(overlay.run())
+        try:
+            await websocket.wait_closed()
+        finally:
+            self.overlays.discard(overlay)
+            writer.cancel()
+            logger.info(
+                f"Overlay disconnected after {overlay.sent} caption(s), "
+                f"{overlay.dropped} final(s) dropped because it fell behind"
+            )
+
+
+def process_request(connection: ServerConnection, request: Request) -> Response | None:
+    path = urlsplit(request.path).path
+    if path == CAPTIONS_PATH:
+        return None
+    if path != "/":
+        return connection.respond(HTTPStatus.NOT_FOUND, "Not found\n")
+    response = connection.respond(HTTPStatus.OK, OVERLAY_PATH.read_text(encoding="utf-8"))
+    # respond() sends text/plain
+    del response.headers["Content-Type"]
+    response.headers["Content-Type"] = "text/html; charset=utf-8"
+    return response
+
+
+def capture_microphone(
+    loop: asyncio.AbstractEventLoop, session: LiveV2AsyncSession, stop_event: threading.Event
+) -> None:
+    """Read the microphone like live-from-microphone.py, handing each buffer to the loop."""
+    # Imported here so --file works on machines without PortAudio
+    import pyaudio
+
+    p = pyaudio.PyAudio()
+    stream = p.open(
+        format=pyaudio.paInt16,
+        channels=CHANNELS,
+        rate=SAMPLE_RATE,
+        input=True,
+        frames_per_buffer=FRAMES_PER_BUFFER,
+    )
+    try:
+        while not stop_event.is_set():
+            # Avoid raising on occasional capture overruns when the consumer is momentarily late.
+            data = stream.read(FRAMES_PER_BUFFER, exception_on_overflow=False)
+            loop.call_soon_threadsafe(session.send_audio, data)
+    finally:
+        stream.stop_stream()
+        stream.close()
+        p.terminate()
+
+
+async def stream_file(session: LiveV2AsyncSession, path: str) -> None:
+    """Stream a file at its real pace instead of the microphone, to try the relay out."""
+    process = await asyncio.create_subprocess_exec(
+        *["ffmpeg", "-v", "error", "-re", "-i", path, "-f", "s16le", "-acodec", "pcm_s16le"],
+        *["-ar", str(SAMPLE_RATE), "-ac", str(CHANNELS), "-"],
+        stdout=asyncio.subprocess.PIPE,
+    )
+    try:
+        while chunk := await process.stdout.read(FRAMES_PER_BUFFER * BIT_DEPTH // 8):
+            session.send_audio(chunk)
+    finally:
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+
+
+def start_session(
+    gladia_client: LiveV2AsyncClient, relay: CaptionRelay, ended_event: asyncio.Event
+) -> LiveV2AsyncSession:
+    source_code = LANGUAGE_CODES.get(relay.source_language) if relay.source_language else None
+    session = gladia_client.start_session(
+        LiveV2InitRequest(
+            encoding="wav/pcm",
+            sample_rate=SAMPLE_RATE,
+            bit_depth=BIT_DEPTH,
+            channels=CHANNELS,
+            language_config=LiveV2LanguageConfig(
+                languages=[source_code] if source_code else [], code_switching=False
+            ),
+            messages_config=LiveV2MessagesConfig(
+                receive_partial_transcripts=True,
+                receive_final_transcripts=True,
+            ),
+        )
+    )
+
+    @session.once("started")
+    def on_started(response: LiveV2InitResponse):
+        logger.info(f"Gladia session {response.id} started")
+
+    @session.on("message")
+    def on_message(message: LiveV2WebSocketMessage):
+        if message.type != "transcript":
+            return
+        text = message.data.utterance.text.strip()
+        if text:
+            relay.publish(text, message.data.is_final)
+
+    @session.on("error")
+    def on_error(error: Exception):
+        logger.error(f"Gladia error: {error}")
+
+    @session.once("ended")
+    def on_ended(ended: LiveV2EndedMessage):
+        logger.info(f"Gladia session {session.session_id} ended")
+        ended_event.set()
+
+    return session
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--source-language",
+        choices=LANGUAGE_CODES,
+        help="Language spoken, detected automatically if omitted. Needed for translations.",
+    )
+    parser.add_argument("--file", help="Stream this file instead of the microphone")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    api_key = os.getenv("GLADIA_API_KEY")
+    if not api_key:
+        raise RuntimeError("GLADIA_API_KEY is not set. Export it in your shell.")
+
+    translations = TranslationCache(args.source_language) if args.source_language else None
+    relay = CaptionRelay(args.source_language, translations)
+    ended_event = asyncio.Event()
+    stop_event = threading.Event()
+
+    async with serve(relay.handle, args.host, args.port, process_request=process_request):
+        logger.info(f"Add a browser source pointing to http://{args.host}:{args.port}/")
+        session = start_session(GladiaClient(api_key=api_key).live_async(), relay, ended_event)
+        if args.file:
+            capture = asyncio.create_task(stream_file(session, args.file))
+        else:
+            capture = asyncio.create_task(
+                asyncio.to_thread(
+                    capture_microphone, asyncio.get_running_loop(), session, stop_event
+                )
+            )
+        ended = asyncio.create_task(ended_event.wait())
+        try:
+            # The session can end or fail mid-stream, so stop capturing as soon as either is done
+            await asyncio.wait({capture, ended}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop_event.set()
+            capture.cancel()
+            if ended_event.is_set():
+                logger.warning("Gladia session ended before the capture, stopping the relay")
+            else:
+                session.stop_recording()
+                try:
+                    # Wait for the last finals to be relayed before closing the overlays
+                    await asyncio.wait_for(ended_event.wait(), timeout=10)
+                except asyncio.TimeoutError:
+                    logger.warning("Gladia session did not end in time")
+            ended.cancel()
+            await relay.flush(timeout=TRANSLATION_TIMEOUT)
+            with contextlib.suppress(asyncio.CancelledError):
+                # Surfaces capture errors, such as a missing ffmpeg or microphone
+                await capture
+
+    if translations is not None:
+        logger.info(
+            f"Translations: {translations.misses} requested, {translations.hits} served from cache"
+        )
+        await translations.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,110 @@
+"""Measure the CPU and memory used by ffmpeg for each recording profile.
+
+Run it inside the container (where the virtual screen and sound card exist), or anywhere
+with `--synthetic` to record ffmpeg test sources instead:
+
+    python3 benchmark_profiles.py --seconds 60
+    python3 benchmark_profiles.py --synthetic --profiles audio low
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+
+from recording import PROFILES, build_record_command
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        # The command name may contain spaces, fields are counted from the closing parenthesis
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def rss_bytes(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def benchmark(profile, seconds, synthetic, output_dir):
+    command = build_record_command(
+        profile,
+        seconds,
+        segment_duration=300,
+        segment_list=f"{output_dir}/segments.csv",
+        output_pattern=f"{output_dir}/segment-%04d.{profile.extension}",
+        synthetic=synthetic,
+    )
+    if synthetic:
+        # Test sources are generated as fast as possible, make them real time like a capture
+        command.insert(1, "-re")
+    process = subprocess.Popen(
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+
+    samples = []
+    peak_rss = 0
+    last_cpu, last_time = 0.0, time.monotonic()
+    while process.poll() is None:
+        time.sleep(1)
+        try:
+            cpu, now = cpu_seconds(process.pid), time.monotonic()
+            peak_rss = max(peak_rss, rss_bytes(process.pid))
+        except (FileNotFoundError, ProcessLookupError):
+            break
+        samples.append((cpu - last_cpu) / (now - last_time) * 100)
+        last_cpu, last_time = cpu, now
+
+    _, stderr = process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed for {profile.name}: {stderr.decode()}")
+
+    output_size = sum(
+        os.path.getsize(f"{output_dir}/{f}")
+        for f in os.listdir(output_dir)
+        if f.startswith("segment-")
+    )
+    return {
+        "avg_cpu": sum(samples) / len(samples) if samples else 0.0,
+        "max_cpu": max(samples, default=0.0),
+        "peak_rss_mb": peak_rss / 1e6,
+        "mb_per_minute": output_size / 1e6 / (seconds / 60),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--profiles", nargs="+", choices=PROFILES, default=list(PROFILES)
+    )
+    parser.add_argument(
+        "--seconds", type=int, default=60, help="Recording length per profile"
+    )
+    parser.add_argument(
+        "--synthetic",
+        action="store_true",
+        help="Record test sources instead of :99 and pulse",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'profile':<8} {'avg CPU%':>9} {'max CPU%':>9} {'peak RSS':>10} {'MB/min':>8}"
+    )
+    for name in args.profiles:
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = benchmark(PROFILES[name], args.seconds, args.synthetic, output_dir)
+        print(
+            f"{name:<8} {result['avg_cpu']:>9.1f} {result['max_cpu']:>9.1f} "
+            f"{result['peak_rss_mb']:>8.1f}MB {result['mb_per_minute']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
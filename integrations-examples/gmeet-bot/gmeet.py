@@ -1,4 +1,5 @@
 import asyncio
+import mimetypes
 import os
 import subprocess
 import click
@@ -6,13 +7,15 @@ import datetime
 import requests
 import json
 
-from time import sleep
+from time import monotonic, sleep
 
 import undetected_chromedriver as uc
 
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 
+from recording import PROFILES, RECORDINGS_DIR, Recorder, clean_segments
+
 
 def make_request(url, headers, method="GET", data=None, files=None):
     if method == "POST":
@@ -22,15 +25,110 @@ def make_request(url, headers, method="GET", data=None, files=None):
     return response.json()
 
 
-async def run_command_async(command):
-    process = await asyncio.create_subprocess_shell(
-        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-    )
+GLADIA_API_URL = "https://api.gladia.io/v2"
 
-    # Wait for the process to complete
-    stdout, stderr = await process.communicate()
 
-    return stdout, stderr
+def submit_segment(file_name, headers, diarization):
+    file_path = f"{RECORDINGS_DIR}/{file_name}"
+    with open(file_path, "rb") as f:
+        files = [("audio", (file_path, f.read(), mimetypes.guess_type(file_path)[0]))]
+
+    upload_response = make_request(
+        f"{GLADIA_API_URL}/upload/", headers, "POST", files=files
+    )
+    data = {"audio_url": upload_response["audio_url"], "diarization": diarization}
+    post_response = make_request(
+        f"{GLADIA_API_URL}/pre-recorded/",
+        {**headers, "Content-Type": "application/json"},
+        "POST",
+        data=data,
+    )
+    return post_response["result_url"]
+
+
+UPLOAD_ATTEMPTS = 5
+
+
+async def upload_segments(recorder, headers, diarization):
+    jobs = []
+    # File name -> (failed attempts, time of the next attempt), for segments to retry
+    failures = {}
+    skipped = set()
+    while True:
+        # Checked before listing the segments so the last one is not missed
+        finished = recorder.done.is_set()
+        segments = recorder.finished_segments()
+        submitted = {job["file"] for job in jobs}
+        pending = [
+            (file_name, offset)
+            for file_name, offset in segments
+            if file_name not in submitted and file_name not in skipped
+        ]
+        for file_name, offset in pending:
+            attempts, retry_at = failures.get(file_name, (0, 0))
+            if monotonic() < retry_at:
+                continue
+            print(f"- Uploading {file_name} to Gladia...")
+            try:
+                result_url = await asyncio.to_thread(
+                    submit_segment, file_name, headers, diarization
+                )
+                jobs.append(
+                    {"file": file_name, "offset": offset, "result_url": result_url}
+                )
+            except Exception as e:
+                attempts += 1
+                if attempts < UPLOAD_ATTEMPTS:
+                    delay = 2**attempts
+                    print(f"- Failed to submit {file_name}, retrying in {delay}s: {e}")
+                    failures[file_name] = (attempts, monotonic() + delay)
+                else:
+                    # A transcript with a gap is more useful than no transcript at all
+                    print(f"- Giving up on {file_name} after {attempts} attempts: {e}")
+                    skipped.add(file_name)
+        # Retried segments can be submitted after later ones
+        jobs.sort(key=lambda job: job["offset"])
+        if finished and len(jobs) + len(skipped) == len(segments):
+            return jobs
+        await asyncio.sleep(1)
+
+
+def poll_result(result_url, headers):
+    while True:
+        poll_response = make_request(result_url, headers)
+        if poll_response.get("status") in ("done", "error"):
+            return poll_response
+        print("Transcription status:", poll_response.get("status"))
+        sleep(1)
+
+
+def merge_transcripts(results):
+    """Put the utterances of every segment back on the timeline of the whole meeting.
+
+    Speaker ids come from each segment's own diarization and are not matched across segments.
+    """
+    segments = []
+    utterances = []
+    for job, response in results:
+        segments.append(
+            {**job, "status": response.get("status"), "id": response.get("id")}
+        )
+        if response.get("status") != "done":
+            continue
+        for utterance in response["result"]["transcription"]["utterances"]:
+            offset = job["offset"]
+            utterance["start"] += offset
+            utterance["end"] += offset
+            for word in utterance.get("words", []):
+                word["start"] += offset
+                word["end"] += offset
+            utterances.append(utterance)
+
+    return {
+        "segments": segments,
+        "full_transcript": " ".join(u["text"].strip() for u in utterances),
+        "utterances": utterances,
+    }
 
 
 async def google_sign_in(email, password, driver):
@@ -339,27 +437,6 @@ async def join_meet():
     duration = os.getenv("DURATION_IN_MINUTES", 15)
     duration = int(duration) * 60
 
-    print("Start recording")
-    record_command = f"ffmpeg -y -video_size 1920x1080 -framerate 30 -f x11grab -i :99 -f pulse -i default -t {duration} -c:v libx264 -pix_fmt yuv420p -c:a aac -strict experimental recordings/output.mp4"
-
-    await asyncio.gather(
-        run_command_async(record_command),
-    )
-
-    print("Done recording")
-    print("Transcribing using Gladia")
-
-    file_path = "recordings/output.mp4"  # Change with your file path
-
-    if os.path.exists(file_path):  # This is here to check if the file exists
-        print("- File exists")
-    else:
-        print("- File does not exist")
-
-    file_name, file_extension = os.path.splitext(
-        file_path
-    )  # Get your audio file name + extension
-
     if str(os.getenv("DIARIZATION")).lower() in [
         "true",
         "t",
@@ -373,58 +450,38 @@ async def join_meet():
     else:
         diarization = "false"
 
-    with open(file_path, "rb") as f:  # Open the file
-        file_content = f.read()  # Read the content of the file
-
     headers = {
         "x-gladia-key": os.getenv("GLADIA_API_KEY", ""),
         "accept": "application/json",
     }
 
-    files = [("audio", (file_path, file_content, "video/" + file_extension[1:]))]
-
-    print("- Uploading file to Gladia...")
-    upload_response = make_request(
-        "https://api.gladia.io/v2/upload/", headers, "POST", files=files
+    profile = PROFILES[os.getenv("RECORDING_PROFILE", "full")]
+    recorder = Recorder(
+        profile, duration, int(os.getenv("SEGMENT_DURATION_IN_SECONDS", 300))
     )
-    print("Upload response with File ID:", upload_response)
-    audio_url = upload_response.get("audio_url")
-
-    data = {
-        "audio_url": audio_url,
-        "diarization": diarization,
-    }
-
-    headers["Content-Type"] = "application/json"
+    clean_segments()
 
-    print("- Sending request to Gladia API...")
-    post_response = make_request(
-        "https://api.gladia.io/v2/pre-recorded/", headers, "POST", data=data
+    print(f"Start recording ({profile.name} profile)")
+    # Segments are uploaded and submitted while the meeting goes on, so once it ends only the
+    # last one is left to upload
+    _, jobs = await asyncio.gather(
+        recorder.run(), upload_segments(recorder, headers, diarization)
     )
+    print("Done recording")
 
-    print("Post response with Transcription ID:", post_response)
-    result_url = post_response.get("result_url")
-
-    if result_url:
-        while True:
-            print("Polling for results...")
-            poll_response = make_request(result_url, headers)
-
-            if poll_response.get("status") == "done":
-                file_path = "recordings/transcript.json"
-                print("- Transcription done | recording results to {file_path}")
-                # save the json response to recordings folder as transcript.json
-                with open(file_path, "w") as f:
-                    json.dump(poll_response, f, indent=2)
-                break
-            elif poll_response.get("status") == "error":
-                file_path = "recordings/error.json"
-                print("- Transcription failed | recording results to {file_path}")
-                with open(file_path, "w") as f:
-                    json.dump(poll_response, f, indent=2)
-            else:
-                print("Transcription status:", poll_response.get("status"))
-            sleep(1)
+    print("Transcribing using Gladia")
+    results = []
+    for job in jobs:
+        print(f"- Waiting for {job['file']}...")
+        results.append(
+            (job, await asyncio.to_thread(poll_result, job["result_url"], headers))
+        )
+
+    file_path = f"{RECORDINGS_DIR}/transcript.json"
+    print(f"- Transcription done | recording results to {file_path}")
+    with open(file_path, "w") as f:
+        # Compact separators: indenting word-level timings roughly doubles the file size
+        json.dump(merge_transcripts(results), f, separators=(",", ":"))
 
     print("- End of work")
 
@@ -0,0 +1,264 @@
+import asyncio
+import csv
+import os
+import time
+from dataclasses import dataclass
+
+RECORDINGS_DIR = "recordings"
+DISPLAY = ":99"
+SCREEN_SIZE = "1920x1080"
+MAX_RESTARTS = 5
+PROGRESS_LOG_INTERVAL = 30
+
+
+@dataclass(frozen=True)
+class RecordingProfile:
+    name: str
+    # Captured frames per second, 0 to record the audio only
+    framerate: int
+    output_args: list[str]
+    extension: str
+
+
+PROFILES = {
+    # Everything Gladia needs for the transcript, for a fraction of the CPU of a video encode
+    "audio": RecordingProfile(
+        name="audio",
+        framerate=0,
+        output_args=["-c:a", "aac", "-b:a", "96k"],
+        extension="m4a",
+    ),
+    # Enough to see who is sharing what: few frames, downscaled, single-threaded encode
+    "low": RecordingProfile(
+        name="low",
+        framerate=5,
+        output_args=[
+            "-vf",
+            "scale=960:-2",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "ultrafast",
+            "-crf",
+            "30",
+            "-threads",
+            "1",
+            "-pix_fmt",
+            "yuv420p",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "96k",
+        ],
+        extension="mp4",
+    ),
+    "full": RecordingProfile(
+        name="full",
+        framerate=30,
+        output_args=[
+            "-c:v",
+            "libx264",
+            "-preset",
+            "veryfast",
+            "-pix_fmt",
+            "yuv420p",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "128k",
+        ],
+        extension="mp4",
+    ),
+}
+
+
+def input_args(profile, synthetic=False):
+    """ffmpeg inputs for the profile; `synthetic` replaces the screen and sound card by test sources."""
+    args = []
+    if profile.framerate:
+        if synthetic:
+            args += [
+                "-f",
+                "lavfi",
+                "-i",
+                f"testsrc2=size={SCREEN_SIZE}:rate={profile.framerate}",
+            ]
+        else:
+            args += [
+                "-video_size",
+                SCREEN_SIZE,
+                "-framerate",
+                str(profile.framerate),
+                "-f",
+                "x11grab",
+                "-i",
+                DISPLAY,
+            ]
+    if synthetic:
+        args += ["-f", "lavfi", "-i", "sine=frequency=440:sample_rate=48000"]
+    else:
+        args += ["-f", "pulse", "-i", "default"]
+    return args
+
+
+def build_record_command(
+    profile, duration, segment_duration, segment_list, output_pattern, synthetic=False
+):
+    command = [
+        "ffmpeg",
+        "-y",
+        "-nostats",
+        "-loglevel",
+        "warning",
+        "-progress",
+        "pipe:1",
+    ]
+    command += input_args(profile, synthetic)
+    command += ["-t", str(duration)] + profile.output_args
+    if profile.framerate:
+        # Segments can only be cut on key frames
+        command += ["-force_key_frames", f"expr:gte(t,n_forced*{segment_duration})"]
+    command += [
+        "-f",
+        "segment",
+        # Fragmented MP4 flushed every second: if ffmpeg crashes, the segment it was writing is
+        # still playable up to its last full second, instead of lacking its index entirely
+        "-segment_format_options",
+        "movflags=+empty_moov+default_base_moof:frag_duration=1000000:flush_packets=1",
+        "-segment_time",
+        str(segment_duration),
+        "-reset_timestamps",
+        "1",
+        "-segment_list",
+        segment_list,
+        "-segment_list_type",
+        "csv",
+        output_pattern,
+    ]
+    return command
+
+
+async def log_progress(stream, label):
+    """Read ffmpeg's `-progress` output as it comes instead of buffering it until exit."""
+    progress = {}
+    logged_at = 0.0
+    async for line in stream:
+        key, _, value = line.decode().strip().partition("=")
+        progress[key] = value
+        # Each progress block ends with a `progress=continue|end` line
+        if key == "progress" and time.monotonic() - logged_at >= PROGRESS_LOG_INTERVAL:
+            logged_at = time.monotonic()
+            print(
+                f"- {label}: {progress.get('out_time', '?')} recorded, "
+                f"{progress.get('fps', '0')} fps, speed {progress.get('speed', '?')}"
+            )
+
+
+class Recorder:
+    """Record the meeting as segments, restarting ffmpeg if it crashes before the end.
+
+    Each ffmpeg run writes its own segment list. Segment start times are relative to the
+    run, so every run remembers when it started within the recording. ffmpeg only lists a
+    segment once it is closed: after a crash, the segment it was writing is added to the list.
+    """
+
+    def __init__(self, profile, duration, segment_duration):
+        self.profile = profile
+        self.duration = duration
+        self.segment_duration = segment_duration
+        self.done = asyncio.Event()
+        # (segment list, offset of the run in the recording, in seconds)
+        self.runs = []
+
+    def finished_segments(self):
+        """Return (file name, start time in seconds) for every segment ffmpeg has closed."""
+        segments = []
+        for segment_list, offset in self.runs:
+            if not os.path.exists(segment_list):
+                continue
+            with open(segment_list) as f:
+                # Skip a line ffmpeg may still be writing
+                lines = [line for line in f.readlines() if line.endswith("\n")]
+            segments += [
+                (name, offset + float(start)) for name, start, _ in csv.reader(lines)
+            ]
+        return segments
+
+    async def run(self):
+        started_at = time.monotonic()
+        try:
+            for attempt in range(MAX_RESTARTS + 1):
+                offset = time.monotonic() - started_at
+                remaining = self.duration - offset
+                if remaining < 1:
+                    return
+                segment_list = f"{RECORDINGS_DIR}/segments-{attempt:02d}.csv"
+                segment_prefix = f"segment-{attempt:02d}-"
+                self.runs.append((segment_list, offset))
+                returncode = await self._run_ffmpeg(
+                    build_record_command(
+                        self.profile,
+                        remaining,
+                        self.segment_duration,
+                        segment_list,
+                        f"{RECORDINGS_DIR}/{segment_prefix}%04d.{self.profile.extension}",
+                    ),
+                    label=f"ffmpeg run {attempt}",
+                )
+                if returncode == 0:
+                    return
+                run_duration = time.monotonic() - started_at - offset
+                list_interrupted_segment(segment_list, segment_prefix, run_duration)
+                print(
+                    f"- ffmpeg exited with code {returncode}, see {RECORDINGS_DIR}/ffmpeg.log"
+                )
+                await asyncio.sleep(1)
+            print(f"- ffmpeg crashed {MAX_RESTARTS + 1} times, giving up")
+        finally:
+            self.done.set()
+
+    async def _run_ffmpeg(self, command, label):
+        with open(f"{RECORDINGS_DIR}/ffmpeg.log", "ab") as log:
+            process = await asyncio.create_subprocess_exec(
+                *command, stdout=asyncio.subprocess.PIPE, stderr=log
+            )
+            await log_progress(process.stdout, label)
+            return await process.wait()
+
+
+def has_fragments(path):
+    """Whether a fragmented MP4 holds any media: its first fragment follows the short header."""
+    with open(path, "rb") as f:
+        return b"moof" in f.read(64 * 1024)
+
+
+def list_interrupted_segment(segment_list, segment_prefix, run_duration):
+    """Add the segment a crashed ffmpeg run was writing to the run's segment list."""
+    lines = []
+    if os.path.exists(segment_list):
+        with open(segment_list) as f:
+            # A line cut short by the crash is dropped, its segment is listed again below
+            lines = [line for line in f.readlines() if line.endswith("\n")]
+    listed = list(csv.reader(lines))
+    listed_names = {name for name, _, _ in listed}
+    unlisted = sorted(
+        f
+        for f in os.listdir(RECORDINGS_DIR)
+        if f.startswith(segment_prefix)
+        and f not in listed_names
+        and has_fragments(f"{RECORDINGS_DIR}/{f}")
+    )
+    if not unlisted:
+        return
+    # Segments follow each other: the interrupted one starts where the last listed one ended
+    start = float(listed[-1][2]) if listed else 0.0
+    lines += [f"{name},{start},{run_duration}\n" for name in unlisted]
+    with open(segment_list, "w") as f:
+        f.writelines(lines)
+    print(f"- Kept {', '.join(unlisted)}, interrupted at {run_duration:.0f}s")
+
+
+def clean_segments():
+    for f in os.listdir(RECORDINGS_DIR):
+        if f.startswith("segment") or f == "ffmpeg.log":
+            os.remove(f"{RECORDINGS_DIR}/{f}")
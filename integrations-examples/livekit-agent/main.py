@@ -1,11 +1,19 @@
 import logging
 import os
+from collections import deque
 
-from livekit.agents import (
+# Every job runs in its own process: they write their metrics here and the worker's /metrics
+# endpoint aggregates them. prometheus_client only reads this variable when it is first
+# imported, by this module or by livekit-agents, so it must be set before the imports below.
+METRICS_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/livekit-agent-metrics")
+os.makedirs(METRICS_DIR, exist_ok=True)
+
+from livekit.agents import (  # noqa: E402
     Agent,
     AgentSession,
     AutoSubscribe,
     JobContext,
+    JobProcess,
     MetricsCollectedEvent,
     RoomOutputOptions,
     StopResponse,
@@ -14,10 +22,37 @@ from livekit.agents import (
     llm,
     metrics,
 )
-from livekit.plugins.gladia.stt import STT as GladiaSTT
+from livekit.agents.utils.hw import get_cpu_monitor  # noqa: E402
+from livekit.plugins.gladia.stt import STT as GladiaSTT  # noqa: E402
+from prometheus_client import Counter, Gauge, Histogram  # noqa: E402
 
 logger = logging.getLogger("transcriber")
 
+# Sessions a single worker accepts before reporting itself as fully loaded
+MAX_SESSIONS_PER_WORKER = int(os.getenv("MAX_SESSIONS_PER_WORKER", "25"))
+# LiveKit stops dispatching jobs to this worker once the load reaches this value
+LOAD_THRESHOLD = float(os.getenv("LOAD_THRESHOLD", "0.75"))
+# Job processes started ahead of time, so new rooms don't wait for a process to boot
+NUM_IDLE_PROCESSES = int(os.getenv("NUM_IDLE_PROCESSES", "3"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+
+STT_AUDIO_SECONDS = Counter("gladia_stt_audio_seconds", "Seconds of audio streamed to Gladia")
+STT_REQUESTS = Counter("gladia_stt_requests", "STT metrics reports received")
+STT_ACQUIRE_TIME = Histogram(
+    "gladia_stt_acquire_seconds", "Time spent acquiring a connection to Gladia"
+)
+TRANSCRIPTION_DELAY = Histogram(
+    "gladia_transcription_delay_seconds",
+    "Time between the end of speech and the final transcript",
+    buckets=(0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0),
+)
+ACTIVE_SESSIONS = Gauge(
+    "gladia_active_sessions", "Transcription sessions running", multiprocess_mode="livesum"
+)
+
+# Smooths out CPU spikes so a single busy sample doesn't stop the worker from taking jobs
+_cpu_samples: deque[float] = deque(maxlen=10)
+
 
 class Transcriber(Agent):
     def __init__(self) -> None:
@@ -25,33 +60,61 @@ class Transcriber(Agent):
             instructions="None",
         )
 
-    async def on_user_turn_completed(
-        self, chat_ctx: llm.ChatContext, new_message: llm.ChatMessage
-    ):
+    async def on_user_turn_completed(self, chat_ctx: llm.ChatContext, new_message: llm.ChatMessage):
         user_transcript = new_message.text_content
         logger.info(f" -> {user_transcript}")
 
         raise StopResponse()
 
 
-async def entrypoint(ctx: JobContext):
+def prewarm(proc: JobProcess):
+    """Runs once per job process, before it is assigned a room."""
     api_key = os.getenv("GLADIA_API_KEY")
     if not api_key:
         raise RuntimeError(
             "GLADIA_API_KEY is not set. Please create a .env from .env.example and set it, or export it in your shell."
         )
 
+    proc.userdata["stt"] = GladiaSTT(api_key=api_key, interim_results=True)
+
+
+def load_fnc(worker) -> float:
+    """Report the worker as loaded when either the CPU or its session slots run out.
+
+    Called every 0.5s from a thread, so sampling the CPU for a short interval is fine.
+    """
+    _cpu_samples.append(get_cpu_monitor().cpu_percent(interval=0.2))
+    cpu_load = sum(_cpu_samples) / len(_cpu_samples)
+    session_load = len(worker.active_jobs) / MAX_SESSIONS_PER_WORKER
+    return min(1.0, max(cpu_load, session_load))
+
+
+async def entrypoint(ctx: JobContext):
     logger.info(f"Starting transcriber (speech to text) in room: {ctx.room.name}")
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
 
     session = AgentSession(
-        stt=GladiaSTT(api_key=api_key, interim_results=True),
+        stt=ctx.proc.userdata["stt"],
     )
 
+    ACTIVE_SESSIONS.inc()
+
+    async def on_shutdown():
+        ACTIVE_SESSIONS.dec()
+
+    ctx.add_shutdown_callback(on_shutdown)
+
     @session.on("metrics_collected")
     def on_metrics_collected(ev: MetricsCollectedEvent):
         metrics.log_metrics(ev.metrics)
 
+        if isinstance(ev.metrics, metrics.STTMetrics):
+            STT_AUDIO_SECONDS.inc(ev.metrics.audio_duration)
+            STT_REQUESTS.inc()
+            STT_ACQUIRE_TIME.observe(ev.metrics.acquire_time)
+        elif isinstance(ev.metrics, metrics.EOUMetrics):
+            TRANSCRIPTION_DELAY.observe(ev.metrics.transcription_delay)
+
     await session.start(
         agent=Transcriber(),
         room=ctx.room,
@@ -64,4 +127,14 @@ async def entrypoint(ctx: JobContext):
 
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint))
+    cli.run_app(
+        WorkerOptions(
+            entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
+            load_fnc=load_fnc,
+            load_threshold=LOAD_THRESHOLD,
+            num_idle_processes=NUM_IDLE_PROCESSES,
+            prometheus_port=METRICS_PORT,
+            prometheus_multiproc_dir=METRICS_DIR,
+        )
+    )
@@ -1,11 +1,9 @@
 import logging
 import os
 
-from pipecat.frames.frames import Frame, TranscriptionFrame, InterimTranscriptionFrame
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
-from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 from pipecat.processors.frameworks.rtvi import (
     RTVIConfig,
     RTVIObserver,
@@ -18,6 +16,8 @@ from pipecat.services.gladia.stt import GladiaSTTService
 from pipecat.transports.base_transport import BaseTransport, TransportParams
 from pipecat.audio.vad.silero import SileroVADAnalyzer
 
+from transcription_logger import FileSink, HttpSink, StdoutSink, TranscriptionLogger
+
 logger = logging.getLogger("transcriber")
 
 transport_params = {
@@ -29,18 +29,6 @@ transport_params = {
 }
 
 
-class TranscriptionLogger(FrameProcessor):
-    async def process_frame(self, frame: Frame, direction: FrameDirection):
-        await super().process_frame(frame, direction)
-
-        if isinstance(frame, TranscriptionFrame):
-            print(f"Transcription: {frame.text}")
-        elif isinstance(frame, InterimTranscriptionFrame):
-            print(f"Partial transcription: {frame.text}")
-
-        await self.push_frame(frame, direction)
-
-
 async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
     logger.info(f"Starting bot {runner_args}")
 
@@ -61,7 +49,14 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
         ),
     )
 
-    tl = TranscriptionLogger()
+    # Transcripts go to stdout by default; set TRANSCRIPT_FILE or TRANSCRIPT_URL to change it
+    if os.getenv("TRANSCRIPT_URL"):
+        sink = HttpSink(os.environ["TRANSCRIPT_URL"])
+    elif os.getenv("TRANSCRIPT_FILE"):
+        sink = FileSink(os.environ["TRANSCRIPT_FILE"])
+    else:
+        sink = StdoutSink()
+    tl = TranscriptionLogger(sink)
 
     pipeline = Pipeline(
         [
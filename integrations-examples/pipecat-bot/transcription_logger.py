@@ -0,0 +1,212 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+
+import aiohttp
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InterimTranscriptionFrame,
+    StartFrame,
+    TranscriptionFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+logger = logging.getLogger("transcriber")
+
+
+class TranscriptSink(ABC):
+    """Destination for batches of transcript lines, written off the pipeline's hot path."""
+
+    @abstractmethod
+    async def write(self, lines: list[str]) -> None: ...
+
+    async def close(self) -> None:
+        pass
+
+
+class StdoutSink(TranscriptSink):
+    async def write(self, lines: list[str]) -> None:
+        # One write per batch, in a worker thread, so a slow terminal never blocks the loop
+        await asyncio.to_thread(self._write, "".join(f"{line}\n" for line in lines))
+
+    @staticmethod
+    def _write(text: str) -> None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+
+class FileSink(TranscriptSink):
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "a", encoding="utf-8")
+        # Cancelling `write` doesn't stop its thread: closing waits for the write in progress
+        self._lock = threading.Lock()
+
+    async def write(self, lines: list[str]) -> None:
+        await asyncio.to_thread(self._write, "".join(f"{line}\n" for line in lines))
+
+    def _write(self, text: str) -> None:
+        with self._lock:
+            self._file.write(text)
+            self._file.flush()
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._close)
+
+    def _close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class HttpSink(TranscriptSink):
+    """POST each batch as `{"lines": [...]}` to a collector endpoint."""
+
+    def __init__(self, url: str) -> None:
+        self._url = url
+        self._session: aiohttp.ClientSession | None = None
+
+    async def write(self, lines: list[str]) -> None:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        async with self._session.post(self._url, json={"lines": lines}) as response:
+            response.raise_for_status()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
+class TranscriptionLogger(FrameProcessor):
+    """Forward transcripts to a sink without ever awaiting the sink from `process_frame`.
+
+    Interim transcripts are coalesced per user: only the latest one seen during each
+    `interim_window` is written. Final transcripts replace any pending interim and are queued
+    for the sink, which receives them in batches from a background task.
+    """
+
+    def __init__(
+        self,
+        sink: TranscriptSink,
+        *,
+        interim_window: float = 0.5,
+        max_batch_size: int = 100,
+        max_queue_size: int = 10_000,
+        stats_interval: float = 30.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._sink = sink
+        self._interim_window = interim_window
+        self._max_batch_size = max_batch_size
+        self._stats_interval = stats_interval
+
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue_size)
+        self._pending_interims: dict[str, str] = {}
+        self._writer_task: asyncio.Task | None = None
+        self._interim_task: asyncio.Task | None = None
+        self._stats_task: asyncio.Task | None = None
+
+        self._frames = 0
+        self._processing_time = 0.0
+        self._max_processing_time = 0.0
+        self._dropped_lines = 0
+        self._max_queue_depth = 0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        started_at = time.perf_counter()
+
+        if isinstance(frame, TranscriptionFrame):
+            self._pending_interims.pop(frame.user_id, None)
+            self._enqueue(f"Transcription: {frame.text}")
+        elif isinstance(frame, InterimTranscriptionFrame):
+            # Latest wins: older partials of the same window are simply overwritten
+            self._pending_interims[frame.user_id] = frame.text
+        elif isinstance(frame, StartFrame):
+            self._start()
+        elif isinstance(frame, EndFrame):
+            await self._stop(flush=True)
+        elif isinstance(frame, CancelFrame):
+            await self._stop(flush=False)
+
+        elapsed = time.perf_counter() - started_at
+        self._frames += 1
+        self._processing_time += elapsed
+        self._max_processing_time = max(self._max_processing_time, elapsed)
+
+        await self.push_frame(frame, direction)
+
+    async def cleanup(self):
+        await super().cleanup()
+        await self._stop(flush=False)
+
+    def _enqueue(self, line: str) -> None:
+        try:
+            self._queue.put_nowait(line)
+        except asyncio.QueueFull:
+            # Dropping a line is better than back-pressuring the audio pipeline
+            self._dropped_lines += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+
+    def _start(self) -> None:
+        if self._writer_task is None:
+            self._writer_task = self.create_task(self._writer_handler())
+            self._interim_task = self.create_task(self._interim_handler())
+            self._stats_task = self.create_task(self._stats_handler())
+
+    async def _stop(self, *, flush: bool) -> None:
+        if self._writer_task is None:
+            return
+        for task in (self._interim_task, self._stats_task):
+            await self.cancel_task(task)
+        if flush:
+            self._flush_interims()
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=5.0)
+            except asyncio.TimeoutError:
+                logger.warning(f"{self._queue.qsize()} transcript line(s) not written on shutdown")
+        await self.cancel_task(self._writer_task)
+        self._writer_task = self._interim_task = self._stats_task = None
+        await self._sink.close()
+        self._log_stats()
+
+    def _flush_interims(self) -> None:
+        for text in self._pending_interims.values():
+            self._enqueue(f"Partial transcription: {text}")
+        self._pending_interims.clear()
+
+    async def _interim_handler(self):
+        while True:
+            await asyncio.sleep(self._interim_window)
+            self._flush_interims()
+
+    async def _writer_handler(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._sink.write(batch)
+            except Exception as err:
+                logger.warning(f"Transcript sink failed, {len(batch)} line(s) lost: {err}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _stats_handler(self):
+        while True:
+            await asyncio.sleep(self._stats_interval)
+            self._log_stats()
+
+    def _log_stats(self) -> None:
+        average = self._processing_time / self._frames if self._frames else 0.0
+        logger.info(
+            f"TranscriptionLogger: {self._frames} frames, "
+            f"avg {average * 1e6:.1f}µs / max {self._max_processing_time * 1e6:.1f}µs per frame, "
+            f"queue depth {self._queue.qsize()} (max {self._max_queue_depth}), "
+            f"{self._dropped_lines} dropped line(s)"
+        )
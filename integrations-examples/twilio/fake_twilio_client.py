@@ -0,0 +1,132 @@
+"""Replay an audio file as one or more concurrent Twilio Media Streams.
+
+Lets you exercise the bridge in main.py without a phone number or a Twilio account:
+
+    uv run fake_twilio_client.py --calls 100 ../../data/anna-and-sasha-16000.wav
+
+`--hang-up-after 0` hangs up right after the stream starts, before the bridge's Gladia session
+is even connected: every one of those sessions must still end (see the bridge logs).
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import subprocess
+import time
+import uuid
+
+from websockets.asyncio.client import connect
+
+# Twilio sends 20 ms of 8 kHz μ-law audio per media message
+FRAME_BYTES = 160
+FRAME_DURATION = 0.02
+
+
+def convert_to_mulaw(input_path: str) -> bytes:
+    result = subprocess.run(
+        ["ffmpeg", "-i", input_path, "-f", "mulaw", "-ar", "8000", "-ac", "1", "-"],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.decode()}")
+    return result.stdout
+
+
+async def fake_call(url: str, audio: bytes, speed: float, hang_up_after: float | None) -> float:
+    """Stream the audio like Twilio would and return how late the last frame was sent."""
+    call_sid = f"CA{uuid.uuid4().hex}"
+    stream_sid = f"MZ{uuid.uuid4().hex}"
+
+    async with connect(url) as websocket:
+        await websocket.send(
+            json.dumps({"event": "connected", "protocol": "Call", "version": "1.0.0"})
+        )
+        await websocket.send(
+            json.dumps(
+                {
+                    "event": "start",
+                    "sequenceNumber": "1",
+                    "streamSid": stream_sid,
+                    "start": {
+                        "streamSid": stream_sid,
+                        "callSid": call_sid,
+                        "tracks": ["inbound"],
+                        "mediaFormat": {
+                            "encoding": "audio/x-mulaw",
+                            "sampleRate": 8000,
+                            "channels": 1,
+                        },
+                        "customParameters": {"caller": "+15550000000"},
+                    },
+                }
+            )
+        )
+
+        if hang_up_after is not None:
+            audio = audio[: int(hang_up_after / FRAME_DURATION) * FRAME_BYTES]
+
+        started_at = time.monotonic()
+        lag = 0.0
+        for chunk, offset in enumerate(range(0, len(audio), FRAME_BYTES)):
+            payload = base64.b64encode(audio[offset : offset + FRAME_BYTES]).decode()
+            await websocket.send(
+                json.dumps(
+                    {
+                        "event": "media",
+                        "sequenceNumber": str(chunk + 2),
+                        "streamSid": stream_sid,
+                        "media": {
+                            "track": "inbound",
+                            "chunk": str(chunk + 1),
+                            "timestamp": str(int(chunk * FRAME_DURATION * 1000)),
+                            "payload": payload,
+                        },
+                    }
+                )
+            )
+            deadline = started_at + (chunk + 1) * FRAME_DURATION / speed
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                lag = max(lag, -delay)
+
+        await websocket.send(json.dumps({"event": "stop", "streamSid": stream_sid}))
+    return lag
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", help="Audio file to replay (any format ffmpeg can read)")
+    parser.add_argument("--url", default="ws://localhost:8080/media")
+    parser.add_argument("--calls", type=int, default=1, help="Number of simultaneous calls")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed (1 = real time)")
+    parser.add_argument(
+        "--hang-up-after",
+        type=float,
+        help="Seconds of audio sent before hanging up (default: the whole file)",
+    )
+    args = parser.parse_args()
+
+    audio = convert_to_mulaw(args.file)
+    print(f"Replaying {len(audio) / 8000:.1f}s of audio on {args.calls} concurrent call(s)")
+
+    started_at = time.monotonic()
+    results = await asyncio.gather(
+        *(fake_call(args.url, audio, args.speed, args.hang_up_after) for _ in range(args.calls)),
+        return_exceptions=True,
+    )
+    failures = [r for r in results if isinstance(r, BaseException)]
+    lags = [r for r in results if not isinstance(r, BaseException)]
+
+    print(f"Done in {time.monotonic() - started_at:.1f}s")
+    print(f"- {len(lags)} call(s) completed, {len(failures)} failed")
+    if lags:
+        print(f"- Worst sending lag behind real time: {max(lags) * 1000:.0f} ms")
+    for failure in failures[:5]:
+        print(f"- Error: {failure!r}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
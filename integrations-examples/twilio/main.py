@@ -0,0 +1,206 @@
+import asyncio
+import base64
+import json
+import logging
+import os
+from html import escape
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from gladiaio_sdk import (
+    GladiaClient,
+    LiveV2AsyncClient,
+    LiveV2AsyncSession,
+    LiveV2EndedMessage,
+    LiveV2InitRequest,
+    LiveV2InitResponse,
+    LiveV2LanguageConfig,
+    LiveV2MessagesConfig,
+    LiveV2WebSocketMessage,
+)
+from websockets.asyncio.server import ServerConnection, serve
+from websockets.http11 import Request, Response
+
+logger = logging.getLogger("twilio-bridge")
+
+# Twilio Media Streams always send 8 kHz, 8-bit, mono μ-law audio
+SAMPLE_RATE = 8000
+BIT_DEPTH = 8
+CHANNELS = 1
+
+MEDIA_STREAM_PATH = "/media"
+
+# How long a session may take to open its WebSocket, then to flush its last transcripts once
+# the call is over, before it is closed on our side
+CONNECT_TIMEOUT = 10.0
+ENDING_TIMEOUT = 30.0
+
+# Sessions whose recording was stopped but which are still flushing their last transcripts.
+# Keeping a reference here prevents them from being garbage collected before "ended".
+ending_sessions: set[LiveV2AsyncSession] = set()
+
+
+def twiml_response(connection: ServerConnection, request: Request) -> Response:
+    """Answer Twilio's voice webhook with a <Stream> pointing back to this server."""
+    public_host = os.getenv("NGROK_DOMAIN") or request.headers.get("Host", "")
+    caller = parse_qs(urlsplit(request.path).query).get("From", ["unknown"])[0]
+    twiml = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        "<Response>"
+        "<Start>"
+        f'<Stream url="wss://{escape(public_host)}{MEDIA_STREAM_PATH}">'
+        f'<Parameter name="caller" value="{escape(caller)}"/>'
+        "</Stream>"
+        "</Start>"
+        "<Say>Call started</Say>"
+        '<Pause length="500"/>'
+        "</Response>"
+    )
+    response = connection.respond(HTTPStatus.OK, twiml)
+    # respond() sets a text/plain Content-Type: replace it instead of adding a second one
+    del response.headers["Content-Type"]
+    response.headers["Content-Type"] = "text/xml"
+    return response
+
+
+def process_request(connection: ServerConnection, request: Request) -> Response | None:
+    # WebSocket upgrades on the media path go through the normal handshake
+    if urlsplit(request.path).path == MEDIA_STREAM_PATH:
+        return None
+    # Any other GET is Twilio's voice webhook (configure it with HTTP GET in the Twilio console)
+    return twiml_response(connection, request)
+
+
+def start_call_session(
+    gladia_client: LiveV2AsyncClient, call_sid: str, caller: str
+) -> LiveV2AsyncSession:
+    session = gladia_client.start_session(
+        LiveV2InitRequest(
+            # Twilio audio is forwarded untouched, so the session must be told it is μ-law at 8 kHz
+            encoding="wav/ulaw",
+            sample_rate=SAMPLE_RATE,
+            bit_depth=BIT_DEPTH,
+            channels=CHANNELS,
+            language_config=LiveV2LanguageConfig(languages=[], code_switching=True),
+            custom_metadata={"call_sid": call_sid, "caller": caller},
+            messages_config=LiveV2MessagesConfig(
+                receive_partial_transcripts=False,
+                receive_final_transcripts=True,
+                # Acknowledgments let the SDK drop audio the server already has, which keeps
+                # memory flat for long calls instead of growing with the call duration.
+                receive_acknowledgments=True,
+            ),
+        )
+    )
+
+    @session.once("started")
+    def on_started(response: LiveV2InitResponse):
+        logger.info(f"[{call_sid}] Gladia session {response.id} started for {caller}")
+
+    @session.on("message")
+    def on_message(message: LiveV2WebSocketMessage):
+        if message.type != "transcript" or not message.data.is_final:
+            return
+        u = message.data.utterance
+        logger.info(f"[{call_sid}] {caller}: {u.text.strip()} ({u.language})")
+
+    @session.on("error")
+    def on_error(error: Exception):
+        logger.error(f"[{call_sid}] Gladia error: {error}")
+
+    @session.once("ended")
+    def on_ended(ended: LiveV2EndedMessage):
+        ending_sessions.discard(session)
+        logger.info(
+            f"[{call_sid}] Gladia session {session.session_id} ended "
+            f"({len(ending_sessions)} other call(s) still ending)"
+        )
+
+    return session
+
+
+async def end_call_session(session: LiveV2AsyncSession, call_sid: str) -> None:
+    """Stop the recording once the session can receive it, and make sure the session ends."""
+    ending_sessions.add(session)
+    connected = asyncio.Event()
+    ended = asyncio.Event()
+    session.once("connected", lambda _: connected.set())
+    session.once("ended", lambda _: ended.set())
+
+    try:
+        # A stop sent while the WebSocket is still opening is lost, which would leave the
+        # session open: calls that hang up right away have to wait for it to connect first
+        if session.status in ("starting", "started", "connecting"):
+            waiting = [asyncio.ensure_future(connected.wait()), asyncio.ensure_future(ended.wait())]
+            _, pending = await asyncio.wait(
+                waiting, timeout=CONNECT_TIMEOUT, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in pending:
+                task.cancel()
+
+        if connected.is_set() or session.status == "connected":
+            session.stop_recording()
+            try:
+                await asyncio.wait_for(ended.wait(), ENDING_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"[{call_sid}] Gladia session did not end, closing it")
+    finally:
+        # No-op if the session already ended
+        session.end_session()
+        ending_sessions.discard(session)
+
+
+async def handle_media_stream(gladia_client: LiveV2AsyncClient, websocket: ServerConnection):
+    """Bridge one Twilio media stream (one call) to its own Gladia live session."""
+    session: LiveV2AsyncSession | None = None
+    call_sid = "unknown"
+
+    try:
+        async for raw_message in websocket:
+            msg = json.loads(raw_message)
+            event = msg.get("event")
+
+            if event == "media":
+                if session is not None:
+                    # Twilio payloads are base64 μ-law frames: decode and forward them as-is
+                    session.send_audio(base64.b64decode(msg["media"]["payload"]))
+            elif event == "start":
+                start = msg["start"]
+                call_sid = start.get("callSid", call_sid)
+                caller = start.get("customParameters", {}).get("caller", "unknown")
+                logger.info(f"[{call_sid}] Starting media stream...")
+                session = start_call_session(gladia_client, call_sid, caller)
+            elif event == "stop":
+                logger.info(f"[{call_sid}] Media stream stopped")
+                break
+    except Exception as err:
+        logger.warning(f"[{call_sid}] Media stream error: {err}")
+    finally:
+        if session is not None and session.status != "ended":
+            await end_call_session(session, call_sid)
+
+
+async def main():
+    api_key = os.getenv("GLADIA_API_KEY")
+    if not api_key:
+        raise RuntimeError(
+            "GLADIA_API_KEY is not set. Please create a .env from .env.example and set it, or export it in your shell."
+        )
+    port = int(os.getenv("PORT", "8080"))
+
+    # A single client is shared by every call so they all reuse the same HTTP connection pool
+    gladia_client = GladiaClient(api_key=api_key).live_async()
+
+    async with serve(
+        lambda websocket: handle_media_stream(gladia_client, websocket),
+        "0.0.0.0",
+        port,
+        process_request=process_request,
+    ) as server:
+        logger.info(f"Listening on port {port}")
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(main())
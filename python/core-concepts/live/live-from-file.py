@@ -1,10 +1,15 @@
 # pip install gladiaio-sdk
+import hashlib
+import mmap
+import os
 import subprocess
 import threading
+from pathlib import Path
 from time import sleep
 
 from gladiaio_sdk import (
     GladiaClient,
+    LiveV2Client,
     LiveV2EndedMessage,
     LiveV2InitRequest,
     LiveV2InitResponse,
@@ -18,96 +23,122 @@ BIT_DEPTH = 16
 CHANNELS = 1
 ENDPOINTING = 0.1
 
-# Create your account and get your API key in 30 seconds ! [Click here](https://docs.gladia.io/chapters/introduction/getting-started) to get started.
-gladia_client = GladiaClient(api_key="GLADIA_API_KEY").live()
-audio_url = "../data/online-meeting-example.mp4"
+# Decoded audio is kept here so replaying the same file doesn't run ffmpeg again
+pcm_cache_dir = Path(os.getenv("GLADIA_PCM_CACHE_DIR", "~/.cache/gladia-samples/pcm")).expanduser()
 
 
 ## If necessary, convert the audio file to PCM:
-def convert_to_pcm(input_path: str) -> bytes:
-    result = subprocess.run(
-        [
-            "ffmpeg",
-            "-i",
-            input_path,
-            "-f",
-            "s16le",
-            "-acodec",
-            "pcm_s16le",
-            "-ar",
-            str(SAMPLE_RATE),
-            "-ac",
-            str(CHANNELS),
-            "-",
-        ],
-        capture_output=True,
+def convert_to_pcm(input_path: str) -> mmap.mmap:
+    # The cache key covers the file's path, size and modification time, plus the output format:
+    # an edited file or a different sample rate never reuses stale audio, and finding the entry
+    # doesn't read the file.
+    source = Path(input_path).resolve()
+    stat = source.stat()
+    key = hashlib.sha256(f"{source}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()
+    cache_path = pcm_cache_dir / f"{key}-{SAMPLE_RATE}hz-{CHANNELS}ch.s16le"
+
+    # An empty entry can only be left over from an older run, so it is converted again
+    if not cache_path.exists() or cache_path.stat().st_size == 0:
+        pcm_cache_dir.mkdir(parents=True, exist_ok=True)
+        # ffmpeg writes straight to disk, then the file is renamed so concurrent replays never
+        # open a half-written cache entry.
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        result = subprocess.run(
+            [
+                "ffmpeg",
+                "-y",
+                "-i",
+                input_path,
+                "-f",
+                "s16le",
+                "-acodec",
+                "pcm_s16le",
+                "-ar",
+                str(SAMPLE_RATE),
+                "-ac",
+                str(CHANNELS),
+                str(tmp_path),
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        if result.returncode != 0:
+            tmp_path.unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg failed: {result.stderr.decode()}")
+        # A file without an audio stream converts "successfully" to nothing, which can't be mapped
+        if tmp_path.stat().st_size == 0:
+            tmp_path.unlink()
+            raise RuntimeError(f"ffmpeg produced no audio for {input_path}")
+        os.replace(tmp_path, cache_path)
+
+    # Memory-mapping keeps the audio out of the Python heap, and the OS shares the same pages
+    # between every process replaying this file.
+    with open(cache_path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def run(gladia_client: LiveV2Client, audio_url: str = "../data/online-meeting-example.mp4"):
+    pcm_audio = convert_to_pcm(audio_url)
+    print(f"Audio: {len(pcm_audio)} bytes of raw PCM")
+
+    ended_event = threading.Event()
+
+    session = gladia_client.start_session(
+        LiveV2InitRequest(
+            # Check the encoding, bit depth, sample rate and channels supported at https://docs.gladia.io/api-reference/v2/live/init
+            encoding="wav/pcm",
+            sample_rate=SAMPLE_RATE,
+            bit_depth=BIT_DEPTH,
+            channels=CHANNELS,
+            # Check the language code supported at https://docs.gladia.io/chapters/language/supported-languages#supported-languages
+            language_config=LiveV2LanguageConfig(languages=["en"], code_switching=False),
+            messages_config=LiveV2MessagesConfig(
+                receive_partial_transcripts=False,
+                receive_final_transcripts=True,
+            ),
+        )
     )
-    if result.returncode != 0:
-        raise RuntimeError(f"ffmpeg failed: {result.stderr.decode()}")
-    return result.stdout
-
-
-pcm_audio = convert_to_pcm(audio_url)
-print(f"Audio: {len(pcm_audio)} bytes of raw PCM")
-
-
-ended_event = threading.Event()
-
-session = gladia_client.start_session(
-    LiveV2InitRequest(
-        # Check the encoding, bit depth, sample rate and channels supported at https://docs.gladia.io/api-reference/v2/live/init
-        encoding="wav/pcm",
-        sample_rate=SAMPLE_RATE,
-        bit_depth=BIT_DEPTH,
-        channels=CHANNELS,
-        # Check the language code supported at https://docs.gladia.io/chapters/language/supported-languages#supported-languages
-        language_config=LiveV2LanguageConfig(languages=["en"], code_switching=False),
-        messages_config=LiveV2MessagesConfig(
-            receive_partial_transcripts=False,
-            receive_final_transcripts=True,
-        ),
-    )
-)
-
-
-@session.once("started")
-def on_started(response: LiveV2InitResponse):
-    print(f"\n################ Begin session {response.id} ################\n")
-
-
-@session.on("message")
-def on_message(message: LiveV2WebSocketMessage):
-    if message.type != "transcript":
-        return
-    u = message.data.utterance
-    if message.data.is_final:
-        print(f"{u.start:.3f} --> {u.end:.3f} | {u.text.strip()}")
 
-
-@session.on("error")
-def on_error(error: Exception):
-    try:
-        print(f"Error: {error}")
-    finally:
+    @session.once("started")
+    def on_started(response: LiveV2InitResponse):
+        print(f"\n################ Begin session {response.id} ################\n")
+
+    @session.on("message")
+    def on_message(message: LiveV2WebSocketMessage):
+        if message.type != "transcript":
+            return
+        u = message.data.utterance
+        if message.data.is_final:
+            print(f"{u.start:.3f} --> {u.end:.3f} | {u.text.strip()}")
+
+    @session.on("error")
+    def on_error(error: Exception):
+        try:
+            print(f"Error: {error}")
+        finally:
+            ended_event.set()
+
+    @session.once("ended")
+    def on_ended(ended: LiveV2EndedMessage):
+        print(f"\n################ End session {session.session_id} ################\n")
         ended_event.set()
 
-
-@session.once("ended")
-def on_ended(ended: LiveV2EndedMessage):
-    print(f"\n################ End session {session.session_id} ################\n")
-    ended_event.set()
-
-
-def stream_file():
-    chunk_size = int(SAMPLE_RATE * (BIT_DEPTH // 8) * CHANNELS * ENDPOINTING)
-    offset = 0
-    while offset < len(pcm_audio):
-        session.send_audio(pcm_audio[offset : offset + chunk_size])
-        offset += chunk_size
-        sleep(ENDPOINTING)
-    print(">>>>> Sent all audio data")
-    session.stop_recording()
-
-
-threading.Thread(target=stream_file, daemon=True).start()
-ended_event.wait()
+    def stream_file():
+        chunk_size = int(SAMPLE_RATE * (BIT_DEPTH // 8) * CHANNELS * ENDPOINTING)
+        offset = 0
+        # The audio is unmapped once sent, or once the session ended early, e.g. on an error
+        with pcm_audio:
+            while offset < len(pcm_audio) and not ended_event.is_set():
+                session.send_audio(pcm_audio[offset : offset + chunk_size])
+                offset += chunk_size
+                sleep(ENDPOINTING)
+        print(">>>>> Sent all audio data")
+        session.stop_recording()
+
+    threading.Thread(target=stream_file, daemon=True).start()
+    ended_event.wait()
+
+
+if __name__ == "__main__":
+    # Create your account and get your API key in 30 seconds ! [Click here](https://docs.gladia.io/chapters/introduction/getting-started) to get started.
+    run(GladiaClient(api_key="GLADIA_API_KEY").live())
@@ -1,16 +1,14 @@
 # pip install gladiaio-sdk
 import asyncio
 
-from gladiaio_sdk import GladiaClient
+from gladiaio_sdk import GladiaClient, PreRecordedV2AsyncClient
 
 
-async def main() -> None:
-
-    # Create your account and get your API key in 30 seconds ! [Click here](https://docs.gladia.io/chapters/introduction/getting-started) to get started.
-    gladia_client = GladiaClient(api_key="GLADIA_API_KEY").prerecorded_async()
-
+async def run(
+    gladia_client: PreRecordedV2AsyncClient, audio_url: str = "../data/anna-and-sasha-16000.wav"
+) -> None:
     transcription = await gladia_client.transcribe(
-        audio_url="../data/anna-and-sasha-16000.wav",
+        audio_url=audio_url,
         options={
             "language_config": {
                 # check all the supported languages at https://docs.gladia.io/chapters/language/supported-languages#supported-languages
@@ -22,5 +20,13 @@ async def main() -> None:
     print(transcription.result.transcription.full_transcript)
 
 
+async def main() -> None:
+
+    # Create your account and get your API key in 30 seconds ! [Click here](https://docs.gladia.io/chapters/introduction/getting-started) to get started.
+    gladia_client = GladiaClient(api_key="GLADIA_API_KEY").prerecorded_async()
+
+    await run(gladia_client)
+
+
 if __name__ == "__main__":
     asyncio.run(main())
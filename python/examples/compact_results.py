@@ -0,0 +1,221 @@
+# !pip install ijson httpx
+"""Store huge pre-recorded results in a compact archive and read back only what you need.
+
+The result body is parsed while it downloads, without ever holding the whole document in
+memory, and written to a zip archive with one member per section:
+
+    job.json                              id, status, file, request_params, ...
+    result/metadata.json
+    result/transcription.json             full_transcript, languages, ... (without utterances)
+    result/transcription/utterances.jsonl one utterance per line
+    result/summarization.json
+    ...
+
+Members are compact JSON, deflated with `--compress`. Reading `summarization` only inflates
+that member, and utterances are streamed one line at a time.
+
+    uv run python examples/compact_results.py store <job id or result.json> meeting.zip --compress
+    uv run python examples/compact_results.py show meeting.zip --section summarization
+    uv run python examples/compact_results.py show meeting.zip --utterances
+"""
+
+import argparse
+import json
+import os
+import zipfile
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import httpx
+import ijson
+from ijson.common import ObjectBuilder
+
+GLADIA_API_URL = os.getenv("GLADIA_API_URL", "https://api.gladia.io")
+# Create your account and get your API key in 30 seconds at https://docs.gladia.io/chapters/introduction/getting-started
+GLADIA_API_KEY = "GLADIA_API_KEY"
+
+# Arrays written one item per line instead of as a single JSON value, so neither writing nor
+# reading them needs the whole array in memory
+SPLIT_ARRAYS = {"result.transcription.utterances": "result/transcription/utterances.jsonl"}
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _ValueBuilder:
+    """Build one JSON value from ijson events and tell when it is complete."""
+
+    def __init__(self) -> None:
+        self._builder = ObjectBuilder()
+        self._depth = 0
+
+    @property
+    def value(self) -> Any:
+        return self._builder.value
+
+    def feed(self, event: str, value: Any) -> bool:
+        self._builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            self._depth += 1
+        elif event in ("end_map", "end_array"):
+            self._depth -= 1
+        return self._depth == 0 and event != "map_key"
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact_result(chunks: Iterable[bytes], path: str, compress: bool = False) -> None:
+    """Write the result body received as `chunks` to a sectioned zip archive at `path`."""
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+
+    job: dict[str, Any] = {}
+    # Value being built and where it goes: ("job", key) or ("section", name)
+    current: tuple[_ValueBuilder, str, str] | None = None
+    # Split array being streamed: (archive member, prefix, item being built)
+    split: list[Any] | None = None
+
+    with zipfile.ZipFile(path, "w", compression=compression) as archive:
+
+        def handle(prefix: str, event: str, value: Any) -> None:
+            nonlocal current, split
+            if split is not None:
+                member, split_prefix, item = split
+                if item is None and event == "end_array" and prefix == split_prefix:
+                    member.close()
+                    split = None
+                    return
+                if item is None:
+                    item = _ValueBuilder()
+                if item.feed(event, value):
+                    member.write(f"{_dumps(item.value)}\n".encode())
+                    item = None
+                split[2] = item
+                return
+
+            if prefix in SPLIT_ARRAYS and event == "start_array":
+                member = archive.open(SPLIT_ARRAYS[prefix], "w", force_zip64=True)
+                split = [member, prefix, None]
+                return
+
+            if current is not None:
+                builder, kind, name = current
+                if builder.feed(event, value):
+                    if kind == "job":
+                        job[name] = builder.value
+                    else:
+                        archive.writestr(f"result/{name}.json", _dumps(builder.value))
+                    current = None
+                return
+
+            # Outside of any value: only the top-level and `result` objects themselves
+            if event == "map_key" or prefix in ("", "result"):
+                return
+            if prefix.startswith("result."):
+                current = (_ValueBuilder(), "section", prefix.removeprefix("result."))
+            else:
+                current = (_ValueBuilder(), "job", prefix)
+            handle(prefix, event, value)
+
+        for chunk in chunks:
+            parser.send(chunk)
+            for prefix, event, value in events:
+                handle(prefix, event, value)
+            del events[:]
+        parser.close()
+        for prefix, event, value in events:
+            handle(prefix, event, value)
+
+        archive.writestr("job.json", _dumps(job))
+
+
+def download_result(job_id: str) -> Iterator[bytes]:
+    with httpx.stream(
+        "GET",
+        f"{GLADIA_API_URL}/v2/pre-recorded/{job_id}",
+        headers={"x-gladia-key": GLADIA_API_KEY},
+        timeout=60,
+    ) as response:
+        response.raise_for_status()
+        yield from response.iter_bytes(CHUNK_SIZE)
+
+
+def read_file(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+class CompactResult:
+    """Read sections of an archive written by `compact_result`, one member at a time."""
+
+    def __init__(self, path: str) -> None:
+        self._archive = zipfile.ZipFile(path)
+
+    def __enter__(self) -> "CompactResult":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._archive.close()
+
+    def job(self) -> dict[str, Any]:
+        return json.loads(self._archive.read("job.json"))
+
+    def sections(self) -> list[str]:
+        return [
+            name.removeprefix("result/").removesuffix(".json")
+            for name in self._archive.namelist()
+            if name.startswith("result/") and name.endswith(".json")
+        ]
+
+    def section(self, name: str) -> Any:
+        return json.loads(self._archive.read(f"result/{name}.json"))
+
+    def utterances(self) -> Iterator[dict[str, Any]]:
+        member = SPLIT_ARRAYS["result.transcription.utterances"]
+        if member not in self._archive.namelist():
+            return
+        with self._archive.open(member) as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    store_parser = commands.add_parser("store", help="Download or read a result and compact it")
+    store_parser.add_argument("source", help="Pre-recorded job id, or a result saved as JSON")
+    store_parser.add_argument("archive")
+    store_parser.add_argument("--compress", action="store_true", help="Deflate every member")
+    show_parser = commands.add_parser("show", help="Print parts of a compacted result")
+    show_parser.add_argument("archive")
+    show_parser.add_argument("--section", help="Print a single section, e.g. summarization")
+    show_parser.add_argument("--utterances", action="store_true", help="Print the utterances")
+    args = parser.parse_args(argv)
+
+    if args.command == "store":
+        chunks = (
+            read_file(args.source) if os.path.isfile(args.source) else download_result(args.source)
+        )
+        compact_result(chunks, args.archive, compress=args.compress)
+        print(f"Stored {args.source} in {args.archive} ({os.path.getsize(args.archive)} bytes)")
+        return
+
+    with CompactResult(args.archive) as result:
+        if args.section:
+            print(json.dumps(result.section(args.section), indent=2, ensure_ascii=False))
+        elif args.utterances:
+            for u in result.utterances():
+                print(
+                    f"Speaker {u.get('speaker')} | {u['start']:.3f} --> {u['end']:.3f} | {u['text'].strip()}"
+                )
+        else:
+            job = result.job()
+            print(f"Job {job.get('id')} ({job.get('status')})")
+            print(f"Sections: {', '.join(result.sections())}")
+
+
+if __name__ == "__main__":
+    main()
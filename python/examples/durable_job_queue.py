@@ -0,0 +1,300 @@
+# !pip install gladiaio-sdk
+"""Crash-resumable pre-recorded job queue backed by SQLite.
+
+Every job records its phase (pending -> uploaded -> submitted -> polling -> done/failed)
+together with its `audio_url` and Gladia job id. When the worker restarts, jobs already
+submitted are polled again instead of being re-uploaded and re-submitted.
+
+    uv run python examples/durable_job_queue.py add ../data/*.wav --priority batch
+    uv run python examples/durable_job_queue.py add ../data/anna-and-sasha-16000.wav --priority interactive
+    uv run python examples/durable_job_queue.py run
+    uv run python examples/durable_job_queue.py status
+"""
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from gladiaio_sdk import GladiaClient, HttpError, HttpRetryOptions, PreRecordedV2AsyncClient
+
+DB_PATH = "jobs.sqlite3"
+RESULTS_DIR = Path("results")
+
+# Lower values are scheduled first
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+# Jobs transcribed at the same time. Keep it at or below the concurrency allowed by your plan.
+MAX_IN_FLIGHT = 4
+# Initial and maximum number of API submissions per second
+SUBMIT_RATE = 2.0
+MAX_SUBMIT_RATE = 5.0
+POLL_INTERVAL = 3.0
+# Polling a submitted job backs off up to this interval on network errors, 429s and 5xx
+MAX_POLL_INTERVAL = 60.0
+# Failed uploads, submissions and permanent polling errors allowed per job
+MAX_ATTEMPTS = 5
+
+TRANSCRIPTION_OPTIONS = {
+    # check all the supported languages at https://docs.gladia.io/chapters/language/supported-languages#supported-languages
+    "language_config": {"languages": ["en"]},
+}
+
+
+class AdaptiveTokenBucket:
+    """Token bucket whose refill rate halves on every 429 and slowly grows back on success."""
+
+    def __init__(self, rate: float, max_rate: float, min_rate: float = 0.05) -> None:
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.tokens = 1.0
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.tokens = min(1.0, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + 0.1)
+
+    def on_rate_limited(self, retry_after: float | None) -> None:
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0.0
+        self.blocked_until = time.monotonic() + (retry_after or 1.0 / self.rate)
+        print(f"- Rate limited, slowing down to {self.rate:.2f} submission(s)/s")
+
+
+def open_db(path: str = DB_PATH) -> sqlite3.Connection:
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    # WAL keeps `status` readable from another terminal while the worker is writing
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file TEXT NOT NULL,
+            priority INTEGER NOT NULL,
+            phase TEXT NOT NULL DEFAULT 'pending',
+            audio_url TEXT,
+            job_id TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            updated_at REAL NOT NULL
+        )
+        """
+    )
+    return db
+
+
+def update_job(db: sqlite3.Connection, row_id: int, **fields) -> None:
+    fields["updated_at"] = time.time()
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with db:
+        db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), row_id))
+
+
+def next_job(db: sqlite3.Connection, claimed: set[int]) -> sqlite3.Row | None:
+    rows = db.execute(
+        """
+        SELECT * FROM jobs
+        WHERE phase NOT IN ('done', 'failed')
+        -- In-flight jobs first: they already cost a submission and only need polling
+        ORDER BY phase IN ('submitted', 'polling') DESC, priority, id
+        """
+    ).fetchall()
+    return next((row for row in rows if row["id"] not in claimed), None)
+
+
+def has_unfinished_jobs(db: sqlite3.Connection) -> bool:
+    return (
+        db.execute("SELECT 1 FROM jobs WHERE phase NOT IN ('done', 'failed') LIMIT 1").fetchone()
+        is not None
+    )
+
+
+def is_transient(err: Exception) -> bool:
+    """Whether the request may succeed later: network errors, timeouts, 408, 429 and 5xx."""
+    if isinstance(err, HttpError):
+        return err.status in (408, 429) or err.status >= 500
+    return True
+
+
+def retry_after(err: HttpError) -> float | None:
+    headers = {k.lower(): v for k, v in err.response_headers.items()}
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+def create_client() -> PreRecordedV2AsyncClient:
+    # Create your account and get your API key in 30 seconds at https://docs.gladia.io/chapters/introduction/getting-started
+    return GladiaClient(
+        api_key="GLADIA_API_KEY",
+        # 429s are handled by the scheduler below, so the SDK must not retry them on its own
+        http_retry=HttpRetryOptions(status_codes=[408, (500, 599)]),
+    ).prerecorded_async()
+
+
+async def process_job(
+    gladia_client: PreRecordedV2AsyncClient,
+    db: sqlite3.Connection,
+    job: sqlite3.Row,
+    bucket: AdaptiveTokenBucket,
+):
+    row_id, phase = job["id"], job["phase"]
+    audio_url, job_id = job["audio_url"], job["job_id"]
+
+    if phase == "pending":
+        await bucket.acquire()
+        audio_url = (await gladia_client.upload_file(job["file"])).audio_url
+        update_job(db, row_id, phase="uploaded", audio_url=audio_url)
+        phase = "uploaded"
+
+    if phase == "uploaded":
+        await bucket.acquire()
+        job_id = (await gladia_client.create({**TRANSCRIPTION_OPTIONS, "audio_url": audio_url})).id
+        bucket.on_success()
+        update_job(db, row_id, phase="submitted", job_id=job_id)
+        print(f"- {job['file']}: submitted as {job_id}")
+    else:
+        print(f"- {job['file']}: resuming {job_id}")
+
+    update_job(db, row_id, phase="polling")
+    backoff = POLL_INTERVAL
+    while True:
+        try:
+            response = await gladia_client.get(job_id)
+        except Exception as err:
+            if not is_transient(err):
+                raise
+            # The job keeps running on the server: keep polling without using up its attempts
+            delay = backoff
+            if isinstance(err, HttpError) and err.status == 429:
+                delay = max(delay, retry_after(err) or 0.0)
+            print(f"- {job['file']}: polling {job_id} failed, retrying in {delay:.0f}s: {err}")
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, MAX_POLL_INTERVAL)
+            continue
+        backoff = POLL_INTERVAL
+
+        if response.status == "done":
+            RESULTS_DIR.mkdir(exist_ok=True)
+            result_path = RESULTS_DIR / f"{job_id}.json"
+            result_path.write_text(json.dumps(response.to_dict()))
+            update_job(db, row_id, phase="done", error=None)
+            print(f"- {job['file']}: done -> {result_path}")
+            return
+        if response.status == "error":
+            update_job(db, row_id, phase="failed", error=f"error code {response.error_code}")
+            print(f"- {job['file']}: failed with error code {response.error_code}")
+            return
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+async def worker(
+    gladia_client: PreRecordedV2AsyncClient,
+    db: sqlite3.Connection,
+    bucket: AdaptiveTokenBucket,
+    claimed: set[int],
+):
+    while True:
+        job = next_job(db, claimed)
+        if job is None:
+            # Jobs claimed by other workers may still go back to the queue after a failure
+            if not has_unfinished_jobs(db):
+                return
+            await asyncio.sleep(POLL_INTERVAL)
+            continue
+
+        claimed.add(job["id"])
+        try:
+            await process_job(gladia_client, db, job, bucket)
+        except HttpError as err:
+            if err.status == 429:
+                # Not the job's fault: put it back in the queue once the bucket allows it
+                bucket.on_rate_limited(retry_after(err))
+                claimed.discard(job["id"])
+            elif await record_failure(db, job["id"], err):
+                claimed.discard(job["id"])
+        except Exception as err:
+            if await record_failure(db, job["id"], err):
+                claimed.discard(job["id"])
+
+
+async def record_failure(db: sqlite3.Connection, row_id: int, err: Exception) -> bool:
+    """Store the error and return whether the job should be tried again."""
+    # Re-read the row: the job may have moved to a later phase before failing
+    job = db.execute("SELECT * FROM jobs WHERE id = ?", (row_id,)).fetchone()
+    attempts = job["attempts"] + 1
+    print(f"- {job['file']}: attempt {attempts} failed: {err}")
+    if attempts >= MAX_ATTEMPTS:
+        update_job(db, row_id, attempts=attempts, phase="failed", error=str(err))
+        return False
+    update_job(db, row_id, attempts=attempts, error=str(err))
+    await asyncio.sleep(2**attempts)
+    return True
+
+
+async def run(gladia_client: PreRecordedV2AsyncClient, db: sqlite3.Connection) -> None:
+    bucket = AdaptiveTokenBucket(SUBMIT_RATE, MAX_SUBMIT_RATE)
+    claimed: set[int] = set()
+    await asyncio.gather(
+        *(worker(gladia_client, db, bucket, claimed) for _ in range(MAX_IN_FLIGHT))
+    )
+
+
+def add(db: sqlite3.Connection, files: list[str], priority: str) -> None:
+    with db:
+        db.executemany(
+            "INSERT INTO jobs (file, priority, updated_at) VALUES (?, ?, ?)",
+            [(str(Path(f).resolve()), PRIORITIES[priority], time.time()) for f in files],
+        )
+    print(f"Queued {len(files)} {priority} job(s)")
+
+
+def status(db: sqlite3.Connection) -> None:
+    for row in db.execute("SELECT * FROM jobs ORDER BY priority, id"):
+        details = row["job_id"] or ""
+        if row["error"]:
+            details += f" ({row['error']})"
+        print(f"{row['id']:>5} {row['phase']:<9} {Path(row['file']).name} {details}")
+
+
+async def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_parser = commands.add_parser("add", help="Queue local audio files")
+    add_parser.add_argument("files", nargs="+")
+    add_parser.add_argument("--priority", choices=PRIORITIES, default="batch")
+    commands.add_parser("run", help="Process the queue, resuming in-flight jobs first")
+    commands.add_parser("status", help="Show every job and its phase")
+    args = parser.parse_args(argv)
+
+    db = open_db()
+    if args.command == "add":
+        add(db, args.files, args.priority)
+    elif args.command == "run":
+        await run(create_client(), db)
+    else:
+        status(db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,446 @@
+# !pip install gladiaio-sdk
+"""Raise alerts while watched phrases are spoken, from live partial transcripts.
+
+The phrases and their pronunciations are compiled into an Aho-Corasick automaton whose alphabet
+is words, so thousands of phrases cost one dictionary lookup per transcribed word. Partial
+transcripts repeat and revise the utterance they belong to: the automaton state reached after
+each word is kept, and every update only scans the words after the part it shares with the
+previous one. A phrase already reported from a partial is not reported again when a later
+partial or the final transcript contains it.
+
+The vocabulary file uses the API's `custom_vocabulary_config` format, and is also sent as the
+session's custom vocabulary so the transcription favors those phrases:
+
+    ["recorded line", {"value": "social security number", "pronunciations": ["SSN"]}]
+
+    uv run python examples/live_keyword_alerts.py ../data/call-center-example.mp4 --vocabulary phrases.json
+    uv run python examples/live_keyword_alerts.py --microphone --jsonl alerts.jsonl
+"""
+
+import argparse
+import json
+import queue
+import re
+import signal
+import subprocess
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import asdict, dataclass, field
+
+from gladiaio_sdk import (
+    GladiaClient,
+    LiveV2Client,
+    LiveV2CustomVocabularyConfig,
+    LiveV2CustomVocabularyEntry,
+    LiveV2InitRequest,
+    LiveV2LanguageConfig,
+    LiveV2MessagesConfig,
+    LiveV2RealtimeProcessingConfig,
+    LiveV2Utterance,
+    LiveV2WebSocketMessage,
+)
+
+SAMPLE_RATE = 16_000
+BIT_DEPTH = 16
+CHANNELS = 1
+CHUNK_DURATION = 0.1
+
+DEFAULT_VOCABULARY = [
+    "recorded line",
+    "this call may be recorded",
+    {"value": "social security number", "pronunciations": ["social security", "SSN"]},
+    {"value": "credit card number", "pronunciations": ["card number"]},
+    "cancel my subscription",
+    "speak to a manager",
+]
+
+WORD_PATTERN = re.compile(r"[\w']+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase words without punctuation, the unit both phrases and transcripts are matched on."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class Keyword:
+    # The vocabulary entry, reported in alerts
+    value: str
+    # The phrase that was matched: the value itself or one of its pronunciations
+    variant: str
+    language: str | None = None
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over words, built from a custom vocabulary list."""
+
+    def __init__(self, vocabulary: list[str | dict]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # (length of the phrase in words, keyword) for every phrase ending in that state
+        self._outputs: list[list[tuple[int, Keyword]]] = [[]]
+        for entry in vocabulary:
+            if isinstance(entry, str):
+                entry = {"value": entry}
+            for variant in [entry["value"], *entry.get("pronunciations", [])]:
+                self._add(
+                    tokenize(variant), Keyword(entry["value"], variant, entry.get("language"))
+                )
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def _add(self, words: list[str], keyword: Keyword) -> None:
+        if not words:
+            return
+        state = 0
+        for word in words:
+            if word not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[state][word] = len(self._goto) - 1
+            state = self._goto[state][word]
+        self._outputs[state].append((len(words), keyword))
+
+    def _link(self) -> None:
+        # Breadth first, so the failure state of a state's parent is always already linked
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for word, child in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(word, 0)
+                # Phrases ending at the failure state also end here, e.g. "card number" in
+                # "credit card number"
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+                pending.append(child)
+
+    def step(self, state: int, word: str) -> int:
+        while state and word not in self._goto[state]:
+            state = self._fail[state]
+        return self._goto[state].get(word, 0)
+
+    def outputs(self, state: int) -> list[tuple[int, Keyword]]:
+        return self._outputs[state]
+
+
+@dataclass
+class KeywordHit:
+    keyword: str
+    variant: str
+    channel: int
+    start: float
+    end: float
+    # Whether the phrase was first seen in a final transcript rather than a partial one
+    is_final: bool
+    detected_at: float
+    # Seconds between the end of the phrase in the audio and its detection, if known
+    delay: float | None = None
+
+
+class AlertSink(ABC):
+    """Destination of keyword hits. `emit` runs on the session's receive thread: keep it fast."""
+
+    @abstractmethod
+    def emit(self, hit: KeywordHit) -> None: ...
+
+    def close(self) -> None:
+        pass
+
+
+class ConsoleSink(AlertSink):
+    def emit(self, hit: KeywordHit) -> None:
+        delay = f", {hit.delay * 1000:.0f} ms after it was said" if hit.delay is not None else ""
+        source = "final" if hit.is_final else "partial"
+        print(
+            f"ALERT [{hit.keyword}] channel {hit.channel} {hit.start:.3f} --> {hit.end:.3f} "
+            f'heard "{hit.variant}" in a {source} transcript{delay}'
+        )
+
+
+class JsonlSink(AlertSink):
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "a", encoding="utf-8")
+
+    def emit(self, hit: KeywordHit) -> None:
+        self._file.write(json.dumps(asdict(hit)) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class WebhookSink(AlertSink):
+    """POST each hit as JSON from a background thread, so a slow endpoint never delays matching."""
+
+    def __init__(self, url: str) -> None:
+        self._url = url
+        self._queue: queue.Queue[KeywordHit | None] = queue.Queue()
+        self._thread = threading.Thread(target=self._post_hits, daemon=True)
+        self._thread.start()
+
+    def emit(self, hit: KeywordHit) -> None:
+        self._queue.put(hit)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+
+    def _post_hits(self) -> None:
+        while (hit := self._queue.get()) is not None:
+            request = urllib.request.Request(
+                self._url,
+                data=json.dumps(asdict(hit)).encode(),
+                headers={"Content-Type": "application/json"},
+            )
+            try:
+                urllib.request.urlopen(request, timeout=10).close()
+            except OSError as err:
+                print(f"Webhook failed for {hit.keyword!r}: {err}")
+
+
+@dataclass
+class _Scan:
+    """Progress of the automaton over the current utterance of one channel."""
+
+    words: list[str] = field(default_factory=list)
+    # states[i] is the automaton state after words[:i]
+    states: list[int] = field(default_factory=lambda: [0])
+    hits: list[KeywordHit] = field(default_factory=list)
+
+
+class KeywordSpotter:
+    def __init__(self, automaton: KeywordAutomaton, sinks: list[AlertSink]) -> None:
+        self.automaton = automaton
+        self.sinks = sinks
+        # time.monotonic() when the first audio chunk was sent, used to compute the delay
+        self.audio_started_at: float | None = None
+        self._scans: dict[int, _Scan] = {}
+
+    def feed(self, utterance: LiveV2Utterance, is_final: bool) -> list[KeywordHit]:
+        """Match a partial or final transcript and emit the phrases not reported yet."""
+        # (word, start, end) for every token, timed by the transcript word it comes from
+        tokens = [
+            (token, word.start, word.end)
+            for word in utterance.words
+            for token in tokenize(word.word)
+        ] or [(token, utterance.start, utterance.end) for token in tokenize(utterance.text)]
+
+        scan = self._scans.setdefault(utterance.channel, _Scan())
+        prefix = 0
+        for old, (new, _, _) in zip(scan.words, tokens):
+            if old != new:
+                break
+            prefix += 1
+        del scan.words[prefix:]
+        del scan.states[prefix + 1 :]
+
+        hits = []
+        state = scan.states[prefix]
+        for i in range(prefix, len(tokens)):
+            state = self.automaton.step(state, tokens[i][0])
+            scan.words.append(tokens[i][0])
+            scan.states.append(state)
+            for length, keyword in self.automaton.outputs(state):
+                if keyword.language and keyword.language != utterance.language:
+                    continue
+                hit = self._hit(
+                    keyword, utterance.channel, tokens[i - length + 1][1], tokens[i][2], is_final
+                )
+                # Timestamps move a little between partials, so the same phrase is recognized
+                # by its overlap with a reported one
+                if any(
+                    h.keyword == hit.keyword and h.start < hit.end and hit.start < h.end
+                    for h in scan.hits
+                ):
+                    continue
+                scan.hits.append(hit)
+                hits.append(hit)
+
+        if is_final:
+            del self._scans[utterance.channel]
+        for hit in hits:
+            for sink in self.sinks:
+                sink.emit(hit)
+        return hits
+
+    def _hit(
+        self, keyword: Keyword, channel: int, start: float, end: float, is_final: bool
+    ) -> KeywordHit:
+        delay = None
+        if self.audio_started_at is not None:
+            delay = time.monotonic() - self.audio_started_at - end
+        return KeywordHit(
+            keyword=keyword.value,
+            variant=keyword.variant,
+            channel=channel,
+            start=start,
+            end=end,
+            is_final=is_final,
+            detected_at=time.time(),
+            delay=delay,
+        )
+
+
+def load_vocabulary(path: str) -> list[str | dict]:
+    """Read a JSON custom vocabulary list, or a text file with one phrase per line."""
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    if path.endswith(".json"):
+        return json.loads(content)
+    return [line.strip() for line in content.splitlines() if line.strip()]
+
+
+def stream_file(session, spotter: KeywordSpotter, path: str, stop_event: threading.Event):
+    # ffmpeg decodes the file while it is streamed, at the pace of a live call
+    process = subprocess.Popen(
+        ["ffmpeg", "-v", "error", "-i", path, "-f", "s16le", "-acodec", "pcm_s16le"]
+        + ["-ar", str(SAMPLE_RATE), "-ac", str(CHANNELS), "-"],
+        stdout=subprocess.PIPE,
+    )
+    chunk_size = int(SAMPLE_RATE * (BIT_DEPTH // 8) * CHANNELS * CHUNK_DURATION)
+    try:
+        spotter.audio_started_at = time.monotonic()
+        sent = 0
+        while not stop_event.is_set() and (chunk := process.stdout.read(chunk_size)):
+            session.send_audio(chunk)
+            sent += 1
+            time.sleep(
+                max(0.0, spotter.audio_started_at + sent * CHUNK_DURATION - time.monotonic())
+            )
+    finally:
+        process.kill()
+        process.wait()
+        session.stop_recording()
+
+
+def stream_microphone(session, spotter: KeywordSpotter, stop_event: threading.Event):
+    # Imported here so the module loads on machines without PortAudio
+    import pyaudio
+
+    frames_per_buffer = int(SAMPLE_RATE * CHUNK_DURATION)
+    p = pyaudio.PyAudio()
+    stream = p.open(
+        format=pyaudio.paInt16,
+        channels=CHANNELS,
+        rate=SAMPLE_RATE,
+        input=True,
+        frames_per_buffer=frames_per_buffer,
+    )
+    try:
+        spotter.audio_started_at = time.monotonic()
+        while not stop_event.is_set():
+            session.send_audio(stream.read(frames_per_buffer, exception_on_overflow=False))
+    finally:
+        stream.stop_stream()
+        stream.close()
+        p.terminate()
+        session.stop_recording()
+
+
+def main(argv: list[str] | None = None, gladia_client: LiveV2Client | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", default="../data/call-center-example.mp4")
+    parser.add_argument("--microphone", action="store_true", help="Listen to the microphone")
+    parser.add_argument("--vocabulary", help="JSON custom vocabulary list, or one phrase per line")
+    parser.add_argument("--jsonl", help="Append the alerts to this JSON lines file")
+    parser.add_argument("--webhook", help="POST every alert as JSON to this URL")
+    parser.add_argument(
+        "--no-bias",
+        action="store_true",
+        help="Only spot the phrases, without sending them as custom vocabulary",
+    )
+    args = parser.parse_args(argv)
+
+    vocabulary = load_vocabulary(args.vocabulary) if args.vocabulary else DEFAULT_VOCABULARY
+    started_at = time.perf_counter()
+    automaton = KeywordAutomaton(vocabulary)
+    print(
+        f"Watching {len(vocabulary)} phrase(s), compiled into {len(automaton)} states in "
+        f"{(time.perf_counter() - started_at) * 1000:.1f} ms"
+    )
+
+    sinks: list[AlertSink] = [ConsoleSink()]
+    if args.jsonl:
+        sinks.append(JsonlSink(args.jsonl))
+    if args.webhook:
+        sinks.append(WebhookSink(args.webhook))
+    spotter = KeywordSpotter(automaton, sinks)
+
+    if gladia_client is None:
+        # Create your account and get your API key in 30 seconds at https://docs.gladia.io/chapters/introduction/getting-started
+        gladia_client = GladiaClient(api_key="GLADIA_API_KEY").live()
+
+    realtime_processing = None
+    if not args.no_bias:
+        realtime_processing = LiveV2RealtimeProcessingConfig(
+            custom_vocabulary=True,
+            custom_vocabulary_config=LiveV2CustomVocabularyConfig(
+                vocabulary=[
+                    entry if isinstance(entry, str) else LiveV2CustomVocabularyEntry(**entry)
+                    for entry in vocabulary
+                ]
+            ),
+        )
+
+    ended_event = threading.Event()
+    stop_event = threading.Event()
+    # Ctrl+C stops the recording; the previous handler is restored once the session ended
+    previous_handler = signal.signal(signal.SIGINT, lambda s, f: stop_event.set())
+
+    session = gladia_client.start_session(
+        LiveV2InitRequest(
+            encoding="wav/pcm",
+            sample_rate=SAMPLE_RATE,
+            bit_depth=BIT_DEPTH,
+            channels=CHANNELS,
+            # Check the language code supported at https://docs.gladia.io/chapters/language/supported-languages#supported-languages
+            language_config=LiveV2LanguageConfig(languages=["en"], code_switching=False),
+            realtime_processing=realtime_processing,
+            # Partials are what makes alerts fast: a phrase is usually spotted before its
+            # utterance is even finished
+            messages_config=LiveV2MessagesConfig(
+                receive_partial_transcripts=True,
+                receive_final_transcripts=True,
+            ),
+        )
+    )
+
+    @session.on("message")
+    def on_message(message: LiveV2WebSocketMessage):
+        if message.type == "transcript":
+            spotter.feed(message.data.utterance, message.data.is_final)
+
+    @session.on("error")
+    def on_error(error: Exception):
+        try:
+            print(f"Error: {error}")
+        finally:
+            ended_event.set()
+
+    @session.once("ended")
+    def on_ended(ended):
+        ended_event.set()
+
+    if args.microphone:
+        target, source = stream_microphone, ()
+    else:
+        target, source = stream_file, (args.file,)
+    threading.Thread(
+        target=target, args=(session, spotter, *source, stop_event), daemon=True
+    ).start()
+    ended_event.wait()
+    signal.signal(signal.SIGINT, previous_handler)
+    for sink in sinks:
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
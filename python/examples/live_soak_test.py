@@ -0,0 +1,562 @@
+# !pip install gladiaio-sdk
+"""Soak test for live sessions: stream a file in a loop for hours and track resource drift.
+
+Audio is streamed in real time (or faster with `--speed`) through a live session, by default
+against a local mock live server started in a child process, so nothing is billed and the
+server's own memory doesn't pollute the measurements. Every `--sample-interval` seconds the
+harness records RSS, tracemalloc usage, thread count, the depth of the callback queue, the
+audio the SDK keeps until it is acknowledged and the per-utterance latency. Samples are
+appended to a JSON lines file, and the final report flags every metric that keeps growing.
+
+`--speed` compresses hours of audio into less wall time, but the SDK handles every server
+message on a single thread: if `latency_p95_ms` climbs from the very first samples, the client
+can't keep up and the speed must be lowered.
+
+    uv run python examples/live_soak_test.py ../data/anna-and-sasha-16000.wav --hours 8
+    uv run python examples/live_soak_test.py ../data/anna-and-sasha-16000.wav --hours 1 --speed 10
+    uv run python examples/live_soak_test.py ../data/anna-and-sasha-16000.wav --target gladia
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+import wave
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gladiaio_sdk import (
+    GladiaClient,
+    LiveV2InitRequest,
+    LiveV2LanguageConfig,
+    LiveV2MessagesConfig,
+    LiveV2WebSocketMessage,
+)
+from websockets.sync.server import serve
+
+CHUNK_DURATION = 0.1
+TRACEMALLOC_FRAMES = 5
+
+# A metric is flagged when its least-squares trend exceeds this much growth per hour, once at
+# least MIN_TREND_WINDOW seconds of samples were taken after the warm-up
+MIN_TREND_WINDOW = 1800
+GROWTH_THRESHOLDS = {
+    "rss_mb": 5.0,
+    "traced_mb": 1.0,
+    "threads": 0.5,
+    "callback_queue_depth": 10.0,
+    "unacked_audio_kb": 100.0,
+    "latency_p95_ms": 50.0,
+}
+
+# Mock server: one utterance every few seconds of audio, with a partial every second
+MOCK_UTTERANCE_DURATION = 4.0
+MOCK_PARTIAL_INTERVAL = 1.0
+MOCK_WORDS = "the quick brown fox jumps over the lazy dog".split()
+
+
+## Mock live server, run in a child process ##
+
+
+def run_mock_server(port_queue: multiprocessing.Queue, latency: float, drop_acks: bool) -> None:
+    sessions: dict[str, dict] = {}
+
+    class InitHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            options = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            session_id = str(uuid.uuid4())
+            sessions[session_id] = options
+            body = json.dumps(
+                {
+                    "id": session_id,
+                    "request_id": f"G-{session_id[:8]}",
+                    "version": 2,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "url": f"ws://127.0.0.1:{ws_server.socket.getsockname()[1]}/v2/live?token={session_id}",
+                }
+            ).encode()
+            self.send_response(201)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    def handle_session(websocket):
+        session_id = websocket.request.path.rsplit("token=", 1)[1]
+        options = sessions.pop(session_id)
+        bytes_per_second = options["sample_rate"] * options["bit_depth"] // 8 * options["channels"]
+        outbox: queue.Queue = queue.Queue()
+
+        def send_delayed():
+            # Transcripts are sent `latency` seconds after the audio they cover was received
+            while (item := outbox.get()) is not None:
+                due, message = item
+                time.sleep(max(0.0, due - time.monotonic()))
+                websocket.send(message)
+
+        sender = threading.Thread(target=send_delayed, daemon=True)
+        sender.start()
+
+        def transcript(index: int, start: float, end: float, is_final: bool) -> str:
+            words = [MOCK_WORDS[(index + i) % len(MOCK_WORDS)] for i in range(4)]
+            step = (end - start) / len(words)
+            utterance = {
+                "start": start,
+                "end": end,
+                "confidence": 1.0,
+                "channel": 0,
+                "language": "en",
+                "text": " ".join(words),
+                "words": [
+                    {
+                        "word": w,
+                        "start": start + i * step,
+                        "end": start + (i + 1) * step,
+                        "confidence": 1.0,
+                    }
+                    for i, w in enumerate(words)
+                ],
+            }
+            return json.dumps(
+                {
+                    "session_id": session_id,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "type": "transcript",
+                    "data": {
+                        "id": f"{session_id}-{index}",
+                        "is_final": is_final,
+                        "utterance": utterance,
+                    },
+                }
+            )
+
+        received = 0
+        utterance_index = 0
+        utterance_start = last_partial = 0.0
+        for message in websocket:
+            if isinstance(message, str):
+                if json.loads(message).get("type") == "stop_recording":
+                    break
+                continue
+
+            byte_start, received = received, received + len(message)
+            audio_time = received / bytes_per_second
+            if not drop_acks:
+                websocket.send(
+                    json.dumps(
+                        {
+                            "session_id": session_id,
+                            "created_at": datetime.now(timezone.utc).isoformat(),
+                            "type": "audio_chunk",
+                            "acknowledged": True,
+                            "data": {
+                                "byte_range": [byte_start, received],
+                                "time_range": [byte_start / bytes_per_second, audio_time],
+                            },
+                        }
+                    )
+                )
+            due = time.monotonic() + latency
+            if audio_time - utterance_start >= MOCK_UTTERANCE_DURATION:
+                outbox.put((due, transcript(utterance_index, utterance_start, audio_time, True)))
+                utterance_index += 1
+                utterance_start = last_partial = audio_time
+            elif audio_time - last_partial >= MOCK_PARTIAL_INTERVAL:
+                outbox.put((due, transcript(utterance_index, utterance_start, audio_time, False)))
+                last_partial = audio_time
+
+        outbox.put(None)
+        sender.join()
+        websocket.close()
+
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), InitHandler)
+    ws_server = serve(handle_session, "127.0.0.1", 0)
+    threading.Thread(target=ws_server.serve_forever, daemon=True).start()
+    port_queue.put(http_server.server_address[1])
+    http_server.serve_forever()
+
+
+def start_mock_server(latency: float, drop_acks: bool) -> tuple[multiprocessing.Process, str]:
+    port_queue: multiprocessing.Queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=run_mock_server, args=(port_queue, latency, drop_acks), daemon=True
+    )
+    process.start()
+    return process, f"http://127.0.0.1:{port_queue.get(timeout=10)}"
+
+
+## Audio ##
+
+
+def load_pcm(path: str) -> tuple[bytes, int, int]:
+    """Return 16-bit PCM audio, its sample rate and its number of channels."""
+    try:
+        with wave.open(path, "rb") as f:
+            if f.getsampwidth() == 2 and f.getcomptype() == "NONE":
+                return f.readframes(f.getnframes()), f.getframerate(), f.getnchannels()
+    except (wave.Error, EOFError):
+        pass
+
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-i",
+            path,
+            "-f",
+            "s16le",
+            "-acodec",
+            "pcm_s16le",
+            "-ar",
+            "16000",
+            "-ac",
+            "1",
+            "-",
+        ],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.decode()}")
+    return result.stdout, 16000, 1
+
+
+## Measurements ##
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        # Not Linux: fall back to the peak RSS, reported in bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+    )
+
+
+@dataclass
+class Stats:
+    """Counters shared by the streaming, callback and sampling threads."""
+
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    latencies: list[float] = field(default_factory=list)
+    finals: int = 0
+    partials: int = 0
+    sessions: int = 0
+    errors: int = 0
+
+    def drain_latencies(self) -> list[float]:
+        with self.lock:
+            latencies, self.latencies = self.latencies, []
+        return latencies
+
+
+class SessionClock:
+    """Remember when each part of the audio was sent, to time the matching final transcript."""
+
+    def __init__(self) -> None:
+        self._sent: deque[tuple[float, float]] = deque()
+        self._lock = threading.Lock()
+
+    def sent(self, audio_end: float) -> None:
+        with self._lock:
+            self._sent.append((audio_end, time.monotonic()))
+
+    def latency(self, audio_end: float, received_at: float) -> float | None:
+        with self._lock:
+            # Drop what older utterances covered: the deque must not grow over the session
+            while len(self._sent) > 1 and self._sent[1][0] <= audio_end:
+                self._sent.popleft()
+            if not self._sent or self._sent[0][0] > audio_end + CHUNK_DURATION:
+                return None
+            return received_at - self._sent[0][1]
+
+
+@dataclass
+class Sample:
+    elapsed_s: float
+    rss_mb: float
+    traced_mb: float
+    threads: int
+    callback_queue_depth: int
+    unacked_audio_kb: float
+    utterances: int
+    partials: int
+    latency_p50_ms: float | None
+    latency_p95_ms: float | None
+
+
+## Soak loop ##
+
+
+def stream_sessions(
+    gladia_client,
+    pcm: bytes,
+    sample_rate: int,
+    channels: int,
+    args: argparse.Namespace,
+    callbacks: queue.Queue,
+    stats: Stats,
+    stop: threading.Event,
+    current_session: list,
+) -> None:
+    chunk_size = int(sample_rate * 2 * channels * CHUNK_DURATION)
+    # Pad with the start of the file so the chunk that wraps around is full-size too,
+    # otherwise the audio clock runs ahead of the audio actually sent
+    looped = pcm + (pcm * (chunk_size // len(pcm) + 1))[:chunk_size]
+    session_length = args.session_minutes * 60 or float("inf")
+
+    while not stop.is_set():
+        clock = SessionClock()
+        ended = threading.Event()
+        session = gladia_client.start_session(
+            LiveV2InitRequest(
+                encoding="wav/pcm",
+                sample_rate=sample_rate,
+                bit_depth=16,
+                channels=channels,
+                language_config=LiveV2LanguageConfig(languages=["en"], code_switching=False),
+                messages_config=LiveV2MessagesConfig(
+                    receive_partial_transcripts=True,
+                    receive_final_transcripts=True,
+                ),
+            )
+        )
+
+        # The callback only timestamps and queues the message, like an application handing
+        # work over to its own threads. A growing queue means the consumer can't keep up.
+        @session.on("message")
+        def on_message(message: LiveV2WebSocketMessage, clock=clock):
+            callbacks.put((time.monotonic(), clock, message))
+
+        @session.on("error")
+        def on_error(error: Exception):
+            with stats.lock:
+                stats.errors += 1
+            print(f"Error: {error}")
+
+        session.once("ended", lambda _: ended.set())
+        current_session[0] = session
+        with stats.lock:
+            stats.sessions += 1
+
+        started_at = time.monotonic()
+        chunks = 0
+        while not stop.is_set() and time.monotonic() - started_at < session_length:
+            offset = chunks * chunk_size % len(pcm)
+            session.send_audio(looped[offset : offset + chunk_size])
+            chunks += 1
+            audio_time = chunks * CHUNK_DURATION
+            clock.sent(audio_time)
+            delay = started_at + audio_time / args.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        session.stop_recording()
+        if not ended.wait(timeout=60):
+            print("Session did not end within 60s of stop_recording")
+            session.end_session()
+
+
+def consume_callbacks(callbacks: queue.Queue, stats: Stats) -> None:
+    while (item := callbacks.get()) is not None:
+        received_at, clock, message = item
+        if message.type != "transcript":
+            continue
+        if not message.data.is_final:
+            with stats.lock:
+                stats.partials += 1
+            continue
+        latency = clock.latency(message.data.utterance.end, received_at)
+        with stats.lock:
+            stats.finals += 1
+            if latency is not None:
+                stats.latencies.append(latency)
+
+
+def take_sample(
+    started_at: float, callbacks: queue.Queue, stats: Stats, current_session: list
+) -> Sample:
+    latencies = sorted(stats.drain_latencies())
+    session = current_session[0]
+    # Private SDK state, read on purpose: audio is kept there until the server acknowledges it
+    unacked = len(getattr(session, "_audio_buffer", b"")) if session else 0
+    return Sample(
+        elapsed_s=round(time.monotonic() - started_at, 1),
+        rss_mb=round(rss_mb(), 2),
+        traced_mb=round(tracemalloc.get_traced_memory()[0] / 1e6, 3),
+        threads=threading.active_count(),
+        callback_queue_depth=callbacks.qsize(),
+        unacked_audio_kb=round(unacked / 1e3, 1),
+        utterances=stats.finals,
+        partials=stats.partials,
+        latency_p50_ms=round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+        latency_p95_ms=(
+            round(latencies[int(len(latencies) * 0.95)] * 1000, 1) if latencies else None
+        ),
+    )
+
+
+## Report ##
+
+
+def report(
+    samples: list[Sample], baseline: tracemalloc.Snapshot | None, stats: Stats, warmup: float
+) -> None:
+    # Caches and pools fill up at the start of a run, only the steady state says something
+    steady = [s for s in samples if s.elapsed_s >= warmup] or samples
+    hours = samples[-1].elapsed_s / 3600 if samples else 0
+    print(
+        f"\nSoak report: {hours:.2f} h, {stats.sessions} session(s), {stats.finals} utterances, "
+        f"{stats.partials} partials, {stats.errors} error(s)"
+    )
+    print(f"{'metric':<22} {'start':>10} {'end':>10} {'trend/h':>10}  verdict")
+
+    for metric, threshold in GROWTH_THRESHOLDS.items():
+        points = [(s.elapsed_s / 3600, getattr(s, metric)) for s in steady]
+        points = [(x, y) for x, y in points if y is not None]
+        if len(points) < 3 or points[-1][0] == points[0][0]:
+            print(f"{metric:<22} {'':>10} {'':>10} {'':>10}  not enough samples")
+            continue
+        slope = statistics.linear_regression(*zip(*points)).slope
+        if (points[-1][0] - points[0][0]) * 3600 < MIN_TREND_WINDOW:
+            verdict = "too short to tell"
+        else:
+            verdict = "GROWING" if slope > threshold else "stable"
+        print(f"{metric:<22} {points[0][1]:>10} {points[-1][1]:>10} {slope:>10.2f}  {verdict}")
+
+    if baseline is not None:
+        print(f"\nTop allocation growth since the end of the {warmup:.0f}s warm-up:")
+        # Sorted by absolute difference, so shrinking allocations are skipped rather than ending the list
+        grown = [d for d in take_snapshot().compare_to(baseline, "lineno") if d.size_diff > 0]
+        for diff in grown[:10]:
+            frame = diff.traceback[0]
+            print(
+                f"  {frame.filename}:{frame.lineno}  +{diff.size_diff / 1e3:.1f} kB "
+                f"({diff.count_diff:+d} blocks, {diff.size / 1e3:.1f} kB total)"
+            )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", default="../data/anna-and-sasha-16000.wav")
+    parser.add_argument("--hours", type=float, default=8.0)
+    parser.add_argument("--target", choices=["mock", "gladia"], default="mock")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="Audio sent per second of wall time"
+    )
+    parser.add_argument(
+        "--sample-interval", type=float, default=60.0, help="Seconds between samples"
+    )
+    parser.add_argument("--warmup", type=float, default=300.0, help="Seconds ignored by the trends")
+    parser.add_argument(
+        "--session-minutes",
+        type=float,
+        default=0,
+        help="Restart the session this often (0: one session)",
+    )
+    parser.add_argument(
+        "--output", default="soak.jsonl", help="Append the samples to this JSON lines file"
+    )
+    parser.add_argument(
+        "--mock-latency", type=float, default=0.3, help="Seconds before the mock sends a transcript"
+    )
+    parser.add_argument(
+        "--mock-drop-acks",
+        action="store_true",
+        help="Never acknowledge audio, to check the report catches it",
+    )
+    args = parser.parse_args(argv)
+
+    pcm, sample_rate, channels = load_pcm(args.file)
+    print(f"Looping {len(pcm) / (sample_rate * 2 * channels):.1f}s of audio for {args.hours} h")
+
+    mock_server = None
+    if args.target == "mock":
+        mock_server, api_url = start_mock_server(args.mock_latency, args.mock_drop_acks)
+        gladia_client = GladiaClient(api_key="mock", api_url=api_url).live()
+    else:
+        # Create your account and get your API key in 30 seconds at https://docs.gladia.io/chapters/introduction/getting-started
+        gladia_client = GladiaClient(api_key="GLADIA_API_KEY").live()
+
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+    callbacks: queue.Queue = queue.Queue()
+    stats = Stats()
+    stop = threading.Event()
+    current_session: list = [None]
+
+    consumer = threading.Thread(target=consume_callbacks, args=(callbacks, stats), daemon=True)
+    consumer.start()
+    streamer = threading.Thread(
+        target=stream_sessions,
+        args=(
+            gladia_client,
+            pcm,
+            sample_rate,
+            channels,
+            args,
+            callbacks,
+            stats,
+            stop,
+            current_session,
+        ),
+        daemon=True,
+    )
+    streamer.start()
+
+    started_at = time.monotonic()
+    samples: list[Sample] = []
+    baseline = None
+    try:
+        with open(args.output, "a") as output:
+            while streamer.is_alive() and time.monotonic() - started_at < args.hours * 3600:
+                time.sleep(args.sample_interval)
+                sample = take_sample(started_at, callbacks, stats, current_session)
+                samples.append(sample)
+                output.write(json.dumps(asdict(sample)) + "\n")
+                output.flush()
+                if baseline is None and sample.elapsed_s >= args.warmup:
+                    baseline = take_snapshot()
+                print(
+                    f"[{sample.elapsed_s / 60:7.1f} min] rss {sample.rss_mb} MB, "
+                    f"traced {sample.traced_mb} MB, {sample.threads} threads, "
+                    f"queue {sample.callback_queue_depth}, unacked {sample.unacked_audio_kb} kB, "
+                    f"p95 {sample.latency_p95_ms} ms"
+                )
+    except KeyboardInterrupt:
+        print("\nInterrupted, stopping the session...")
+
+    stop.set()
+    streamer.join(timeout=90)
+    callbacks.put(None)
+    consumer.join(timeout=10)
+    report(samples, baseline, stats, args.warmup)
+    tracemalloc.stop()
+
+    if mock_server is not None:
+        mock_server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+# !pip install gladiaio-sdk
+import asyncio
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from gladiaio_sdk import GladiaClient, PreRecordedV2AsyncClient, PreRecordedV2Utterance
+
+# Target length of each chunk sent to Gladia. Chunks are transcribed concurrently, so the
+# wall-clock time is roughly the time needed for one chunk instead of the whole recording.
+TARGET_SEGMENT_DURATION = 15 * 60
+# How far (in seconds) around each target cut we look for a silence to cut on
+SILENCE_SEARCH_WINDOW = 60
+SILENCE_NOISE_LEVEL = "-35dB"
+SILENCE_MIN_DURATION = 0.4
+# Audio shared by two consecutive chunks. Both transcripts cover it, which is how speakers
+# from one chunk are matched with the speakers of the next one.
+OVERLAP = 20
+MAX_CONCURRENT_JOBS = 8
+
+options = {
+    # check all the supported languages at https://docs.gladia.io/chapters/language/supported-languages#supported-languages
+    "language_config": {"languages": ["en"]},
+    "diarization": True,
+}
+
+
+@dataclass(frozen=True)
+class Segment:
+    index: int
+    # Part of the recording this segment is responsible for in the final transcript
+    keep_start: float
+    keep_end: float
+    # Part of the recording actually sent to Gladia (the kept part plus the overlaps)
+    audio_start: float
+    audio_end: float
+
+
+def probe_duration(path: str) -> float:
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            path,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {result.stderr}")
+    return float(result.stdout.strip())
+
+
+def detect_silences(path: str) -> list[float]:
+    """Return the middle of every silence found in the recording, in seconds."""
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-i",
+            path,
+            "-vn",
+            "-af",
+            f"silencedetect=noise={SILENCE_NOISE_LEVEL}:d={SILENCE_MIN_DURATION}",
+            "-f",
+            "null",
+            "-",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr}")
+    starts = [float(s) for s in re.findall(r"silence_start: (-?[\d.]+)", result.stderr)]
+    ends = [float(e) for e in re.findall(r"silence_end: ([\d.]+)", result.stderr)]
+    return [(start + end) / 2 for start, end in zip(starts, ends)]
+
+
+def plan_segments(duration: float, silences: list[float]) -> list[Segment]:
+    cuts = [0.0]
+    while duration - cuts[-1] > TARGET_SEGMENT_DURATION * 1.5:
+        target = cuts[-1] + TARGET_SEGMENT_DURATION
+        candidates = [s for s in silences if abs(s - target) <= SILENCE_SEARCH_WINDOW]
+        # Fall back to a hard cut when nobody stops talking around the target
+        cuts.append(min(candidates, key=lambda s: abs(s - target)) if candidates else target)
+    cuts.append(duration)
+
+    return [
+        Segment(
+            index=i,
+            keep_start=start,
+            keep_end=end,
+            audio_start=max(0.0, start - OVERLAP),
+            audio_end=min(duration, end + OVERLAP),
+        )
+        for i, (start, end) in enumerate(zip(cuts, cuts[1:]))
+    ]
+
+
+async def extract_segment(path: str, segment: Segment, output_dir: str) -> Path:
+    output = Path(output_dir) / f"segment-{segment.index:04d}.flac"
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-v",
+        "error",
+        "-ss",
+        str(segment.audio_start),
+        "-to",
+        str(segment.audio_end),
+        "-i",
+        path,
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        "16000",
+        str(output),
+        stderr=subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed on segment {segment.index}: {stderr.decode()}")
+    return output
+
+
+async def transcribe_segment(
+    gladia_client: PreRecordedV2AsyncClient,
+    path: str,
+    segment: Segment,
+    output_dir: str,
+    semaphore: asyncio.Semaphore,
+) -> list[PreRecordedV2Utterance]:
+    async with semaphore:
+        segment_path = await extract_segment(path, segment, output_dir)
+        transcription = await gladia_client.transcribe(audio_url=segment_path, options=options)
+        print(f"- Segment {segment.index} transcribed")
+    return [shift(u, segment.audio_start) for u in transcription.result.transcription.utterances]
+
+
+def shift(utterance: PreRecordedV2Utterance, offset: float) -> PreRecordedV2Utterance:
+    """Move an utterance and its words from segment time to recording time."""
+    return replace(
+        utterance,
+        start=utterance.start + offset,
+        end=utterance.end + offset,
+        words=[replace(w, start=w.start + offset, end=w.end + offset) for w in utterance.words],
+    )
+
+
+def match_speakers(
+    previous: list[PreRecordedV2Utterance],
+    current: list[PreRecordedV2Utterance],
+    window_start: float,
+    window_end: float,
+) -> dict[int, int]:
+    """Map the speakers of `current` to the speakers of `previous` they overlap the most with."""
+    overlap: dict[tuple[int, int], float] = defaultdict(float)
+    for p in previous:
+        for c in current:
+            start = max(p.start, c.start, window_start)
+            end = min(p.end, c.end, window_end)
+            if end > start and p.speaker is not None and c.speaker is not None:
+                overlap[(p.speaker, c.speaker)] += end - start
+
+    mapping: dict[int, int] = {}
+    for previous_speaker, current_speaker in sorted(overlap, key=overlap.get, reverse=True):
+        if current_speaker not in mapping and previous_speaker not in mapping.values():
+            mapping[current_speaker] = previous_speaker
+    return mapping
+
+
+def stitch(
+    segments: list[Segment], transcripts: list[list[PreRecordedV2Utterance]]
+) -> list[PreRecordedV2Utterance]:
+    stitched: list[PreRecordedV2Utterance] = []
+    previous: list[PreRecordedV2Utterance] = []
+    next_speaker = 0
+
+    for segment, utterances in zip(segments, transcripts):
+        # `previous` already carries recording-wide speaker ids, so matching against it chains
+        # the labels from the first segment to the last one.
+        mapping = match_speakers(
+            previous, utterances, segment.keep_start - OVERLAP, segment.keep_start + OVERLAP
+        )
+        for speaker in sorted({u.speaker for u in utterances if u.speaker is not None}):
+            if speaker not in mapping:
+                mapping[speaker] = next_speaker
+            next_speaker = max(next_speaker, mapping[speaker] + 1)
+
+        previous = [
+            replace(u, speaker=mapping[u.speaker]) if u.speaker is not None else u
+            for u in utterances
+        ]
+        # Each utterance of an overlap is transcribed twice: keep it in the segment owning its middle
+        stitched.extend(
+            u for u in previous if segment.keep_start <= (u.start + u.end) / 2 < segment.keep_end
+        )
+
+    return stitched
+
+
+async def run(
+    gladia_client: PreRecordedV2AsyncClient,
+    audio_path: str = "../data/online-meeting-example.mp4",
+) -> None:
+    started_at = time.monotonic()
+
+    duration = probe_duration(audio_path)
+    segments = plan_segments(duration, detect_silences(audio_path))
+    print(f"Splitting {duration / 60:.1f} min of audio into {len(segments)} segment(s)")
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+    with tempfile.TemporaryDirectory() as output_dir:
+        transcripts = await asyncio.gather(
+            *(
+                transcribe_segment(gladia_client, audio_path, s, output_dir, semaphore)
+                for s in segments
+            )
+        )
+
+    utterances = stitch(segments, transcripts)
+    for u in utterances:
+        print(f"Speaker {u.speaker} | {u.start:.3f} --> {u.end:.3f} | {u.text.strip()}")
+
+    print(f"\nTranscribed {duration / 60:.1f} min in {time.monotonic() - started_at:.1f}s")
+
+
+if __name__ == "__main__":
+    # Create your account and get your API key in 30 seconds at https://docs.gladia.io/chapters/introduction/getting-started
+    asyncio.run(run(GladiaClient(api_key="GLADIA_API_KEY").prerecorded_async(), *sys.argv[1:2]))
@@ -1,13 +1,17 @@
 # !pip install gladiaio-sdk
-from gladiaio_sdk import GladiaClient
+from gladiaio_sdk import GladiaClient, PreRecordedV2Client
 
-# Create your account and get your API key in 30 seconds at https://docs.gladia.io/chapters/introduction/getting-started
-gladia_client = GladiaClient(api_key="GLADIA_API_KEY").prerecorded()
 
-transcription = gladia_client.transcribe(
-    audio_url="../data/meeting-example.mp4",
-    # check all the summarization options at https://docs.gladia.io/chapters/audio-intelligence/summarization
-    options={"summarization": True, "summarization_config": {"type": "bullet_points"}},
-)
+def run(gladia_client: PreRecordedV2Client, audio_url: str = "../data/meeting-example.mp4") -> None:
+    transcription = gladia_client.transcribe(
+        audio_url=audio_url,
+        # check all the summarization options at https://docs.gladia.io/chapters/audio-intelligence/summarization
+        options={"summarization": True, "summarization_config": {"type": "bullet_points"}},
+    )
 
-print(transcription.result.summarization)
+    print(transcription.result.summarization)
+
+
+if __name__ == "__main__":
+    # Create your account and get your API key in 30 seconds at https://docs.gladia.io/chapters/introduction/getting-started
+    run(GladiaClient(api_key="GLADIA_API_KEY").prerecorded())
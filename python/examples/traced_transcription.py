@@ -0,0 +1,241 @@
+# !pip install gladiaio-sdk
+"""Pre-recorded transcription with one trace span per lifecycle phase.
+
+Each job produces a `prerecorded.job` span with child spans for `upload`, `create`,
+`queue_wait`, `processing`, `polling_overhead` and `fetch`, so slow transcriptions can be
+attributed to the right phase. Local phases are timed with the monotonic clock, while
+`queue_wait` and `processing` come from the server's own `created_at` and `completed_at`, so a
+skewed local clock doesn't distort them. Spans are written as JSON lines (one span per line,
+using OpenTelemetry field names) or, with `--otel`, replayed into the OpenTelemetry SDK if it
+is installed (`pip install opentelemetry-sdk`).
+
+    uv run python examples/traced_transcription.py ../data/anna-and-sasha-16000.wav --jsonl traces.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from gladiaio_sdk import GladiaClient, PreRecordedV2AsyncClient
+
+POLL_INTERVAL = 1.0
+
+options = {
+    # check all the supported languages at https://docs.gladia.io/chapters/language/supported-languages#supported-languages
+    "language_config": {"languages": ["en"]},
+}
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    start_time_unix_nano: int
+    end_time_unix_nano: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+class Tracer:
+    """Collects spans for one job; spans can be timed live or recorded after the fact."""
+
+    def __init__(self) -> None:
+        self.trace_id = secrets.token_hex(16)
+        self.spans: list[Span] = []
+        # Wall clock time is only read once: span times are monotonic offsets from it, so a
+        # clock adjustment during the job can't make a span negative
+        self._wall_origin_ns = time.time_ns()
+        self._monotonic_origin_ns = time.monotonic_ns()
+
+    def now(self) -> int:
+        return self._wall_origin_ns + time.monotonic_ns() - self._monotonic_origin_ns
+
+    @contextmanager
+    def span(self, name: str, parent: Span | None = None, **attributes: Any):
+        span = self._new_span(name, parent, self.now(), attributes)
+        try:
+            yield span
+        finally:
+            span.end_time_unix_nano = self.now()
+
+    def record(
+        self, name: str, parent: Span | None, start_ns: int, end_ns: int, **attributes: Any
+    ) -> Span:
+        span = self._new_span(name, parent, start_ns, attributes)
+        span.end_time_unix_nano = end_ns
+        return span
+
+    def _new_span(
+        self, name: str, parent: Span | None, start_ns: int, attributes: dict[str, Any]
+    ) -> Span:
+        span = Span(
+            name=name,
+            trace_id=self.trace_id,
+            span_id=secrets.token_hex(8),
+            parent_span_id=parent.span_id if parent else None,
+            start_time_unix_nano=start_ns,
+            attributes=attributes,
+        )
+        self.spans.append(span)
+        return span
+
+
+def export_jsonl(spans: list[Span], path: str) -> None:
+    with open(path, "a") as f:
+        for span in spans:
+            f.write(json.dumps(span.__dict__, separators=(",", ":")) + "\n")
+
+
+def export_otel(spans: list[Span]) -> None:
+    """Replay the spans through the OpenTelemetry SDK, using its configured exporters."""
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
+    except ImportError as err:
+        raise RuntimeError(
+            "--otel needs the OpenTelemetry SDK: pip install opentelemetry-sdk"
+        ) from err
+
+    if not isinstance(trace.get_tracer_provider(), TracerProvider):
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+        trace.set_tracer_provider(provider)
+    tracer = trace.get_tracer("gladia-samples")
+
+    otel_spans = {}
+    for span in spans:
+        parent = otel_spans.get(span.parent_span_id)
+        context = trace.set_span_in_context(parent) if parent else None
+        otel_spans[span.span_id] = tracer.start_span(
+            span.name,
+            context=context,
+            start_time=span.start_time_unix_nano,
+            attributes={k: v for k, v in span.attributes.items() if v is not None},
+        )
+    # Children are ended before their parents so exporters see complete subtrees
+    for span in reversed(spans):
+        otel_spans[span.span_id].end(end_time=span.end_time_unix_nano)
+
+
+def parse_date(iso_date: str) -> datetime:
+    return datetime.fromisoformat(iso_date.replace("Z", "+00:00"))
+
+
+def server_duration_ns(start: str, end: str) -> int:
+    """Nanoseconds between two timestamps of the server, both read from its own clock."""
+    return round((parse_date(end) - parse_date(start)).total_seconds() * 1e9)
+
+
+async def traced_transcribe(gladia_client: PreRecordedV2AsyncClient, audio_path: str) -> Tracer:
+    tracer = Tracer()
+    file_size = os.path.getsize(audio_path)
+
+    with tracer.span(
+        "prerecorded.job",
+        **{
+            "file.name": os.path.basename(audio_path),
+            "file.size_bytes": file_size,
+            "gladia.options": json.dumps(options, sort_keys=True),
+        },
+    ) as job:
+        with tracer.span("prerecorded.upload", job, **{"upload.bytes": file_size}) as upload:
+            audio_url = (await gladia_client.upload_file(audio_path)).audio_url
+        upload_seconds = (upload.end_time_unix_nano - upload.start_time_unix_nano) / 1e9
+        upload.attributes["upload.throughput_bytes_per_s"] = file_size / max(upload_seconds, 1e-9)
+
+        with tracer.span("prerecorded.create", job) as create:
+            job_id = (await gladia_client.create({**options, "audio_url": audio_url})).id
+        job.attributes["gladia.job_id"] = job_id
+
+        # Poll ourselves instead of calling poll() to know when the result reached us
+        polls = 0
+        while True:
+            fetch_start_ns = tracer.now()
+            response = await gladia_client.get(job_id)
+            fetch_end_ns = tracer.now()
+            polls += 1
+            if response.status in ("done", "error"):
+                break
+            await asyncio.sleep(POLL_INTERVAL)
+
+        job.attributes["gladia.status"] = response.status
+        job.attributes["polling.requests"] = polls
+
+        if response.completed_at:
+            # Server durations are placed on our timeline from the start of the create request,
+            # which the server's `created_at` can't precede: completion is then never shown
+            # after the response that reported it.
+            created_ns = create.start_time_unix_nano
+            server_ns = server_duration_ns(response.created_at, response.completed_at)
+            metadata = response.result.metadata if response.result else None
+            transcription_time = metadata.transcription_time if metadata else None
+            # The server reports how long the transcription itself took: the rest was queueing
+            processing_ns = server_ns
+            if transcription_time is not None:
+                processing_ns = min(round(transcription_time * 1e9), server_ns)
+            started_ns = created_ns + server_ns - processing_ns
+            completed_ns = created_ns + server_ns
+            job.attributes["gladia.server_duration_s"] = server_ns / 1e9
+
+            tracer.record("prerecorded.queue_wait", job, created_ns, started_ns)
+            tracer.record(
+                "prerecorded.processing",
+                job,
+                started_ns,
+                completed_ns,
+                **{
+                    "gladia.transcription_time_s": transcription_time,
+                    "gladia.audio_duration_s": metadata.audio_duration if metadata else None,
+                },
+            )
+            # Time between the server finishing and its result reaching us, mostly caused by the
+            # poll interval
+            tracer.record("prerecorded.polling_overhead", job, completed_ns, fetch_end_ns)
+        tracer.record("prerecorded.fetch", job, fetch_start_ns, fetch_end_ns)
+
+    return tracer
+
+
+def print_summary(tracer: Tracer) -> None:
+    job, *phases = tracer.spans
+    total = (job.end_time_unix_nano - job.start_time_unix_nano) / 1e9
+    print(f"\n{job.attributes['file.name']} ({job.attributes['file.size_bytes']} bytes)")
+    for span in phases:
+        duration = (span.end_time_unix_nano - span.start_time_unix_nano) / 1e9
+        print(f"  {span.name.removeprefix('prerecorded.'):<17} {duration:8.3f}s")
+    print(f"  {'total':<17} {total:8.3f}s")
+
+
+async def main(
+    argv: list[str] | None = None, gladia_client: PreRecordedV2AsyncClient | None = None
+) -> None:
+    if gladia_client is None:
+        # Create your account and get your API key in 30 seconds at https://docs.gladia.io/chapters/introduction/getting-started
+        gladia_client = GladiaClient(api_key="GLADIA_API_KEY").prerecorded_async()
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", default=["../data/anna-and-sasha-16000.wav"])
+    parser.add_argument("--jsonl", help="Append the spans to this JSON lines file")
+    parser.add_argument("--otel", action="store_true", help="Export through OpenTelemetry")
+    args = parser.parse_args(argv)
+
+    tracers = await asyncio.gather(*(traced_transcribe(gladia_client, f) for f in args.files))
+    for tracer in tracers:
+        print_summary(tracer)
+        if args.jsonl:
+            export_jsonl(tracer.spans, args.jsonl)
+        if args.otel:
+            export_otel(tracer.spans)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
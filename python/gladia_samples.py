@@ -0,0 +1,211 @@
+# !pip install gladiaio-sdk
+"""Run the samples from one warm process that shares a single Gladia client.
+
+    uv run python gladia_samples.py list
+    uv run python gladia_samples.py run meeting-summary
+    uv run python gladia_samples.py run live-file ../data/anna-and-sasha-16000.wav
+    uv run python gladia_samples.py serve < jobs.txt
+
+`run` executes one sample. `serve` keeps the process alive and runs one sample per line read
+on stdin (`<name> [args...]`), so the interpreter, the SDK and its connection pools are set up
+once instead of once per run.
+
+Nothing heavy is imported up front: a sample module, and the SDK or audio libraries it needs,
+are only imported the first time that sample runs. After each run, the time spent importing,
+creating the client and running the sample is printed on stderr: the first run of a sample
+pays for the imports, the next ones in the same process don't. Use `python -X importtime` for
+a breakdown of the interpreter's own startup.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import inspect
+import os
+import shlex
+import sys
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+SAMPLES_DIR = Path(__file__).resolve().parent
+
+
+@dataclass(frozen=True)
+class Sample:
+    path: str
+    # `run(gladia_client, *args)` takes positional arguments, `main(argv, ...)` parses options
+    entrypoint: str = "run"
+    # GladiaClient method creating the client shared with the sample, None if it creates its own
+    client: str | None = None
+
+
+# Same names as [tool.gladia.scripts] in pyproject.toml
+SAMPLES = {
+    "pre-recorded-file": Sample("core-concepts/pre-recorded/pre_recorded.py", client="prerecorded"),
+    "pre-recorded-url": Sample(
+        "core-concepts/pre-recorded/pre_recorded_async.py", client="prerecorded_async"
+    ),
+    "live-file": Sample("core-concepts/live/live-from-file.py", client="live"),
+    "live-microphone": Sample("core-concepts/live/live-from-microphone.py", client="live"),
+    "anonymized-call": Sample("examples/anonymized_call.py", client="prerecorded"),
+    "call-sentiment-analysis": Sample("examples/call_sentiment_analysis.py", client="prerecorded"),
+    "meeting-summary": Sample("examples/meeting_summary.py", client="prerecorded"),
+    "youtube-translation": Sample("examples/youtube_translation.py", client="prerecorded"),
+    "long-file-transcription": Sample(
+        "examples/long_file_transcription.py", client="prerecorded_async"
+    ),
+    # Uses its own retry policy: 429s are handled by its scheduler, not by the SDK
+    "durable-job-queue": Sample("examples/durable_job_queue.py", entrypoint="main"),
+    "traced-transcription": Sample(
+        "examples/traced_transcription.py", entrypoint="main", client="prerecorded_async"
+    ),
+    # Talks to a local mock server unless `--target gladia` is given
+    "live-soak-test": Sample("examples/live_soak_test.py", entrypoint="main"),
+    "compact-results": Sample("examples/compact_results.py", entrypoint="main"),
+    "live-keyword-alerts": Sample(
+        "examples/live_keyword_alerts.py", entrypoint="main", client="live"
+    ),
+}
+
+
+@dataclass
+class Timings:
+    imports: float = 0.0
+    client: float = 0.0
+    run: float = 0.0
+
+
+class Runner:
+    """Imports samples on first use and keeps their modules and clients for the next runs."""
+
+    def __init__(self) -> None:
+        self._modules: dict[str, ModuleType] = {}
+        self._clients: dict[str, Any] = {}
+        self._gladia_client = None
+        # Async clients are bound to the loop they first ran on, so every run reuses this one
+        self._loop = asyncio.new_event_loop()
+
+    def close(self) -> None:
+        self._loop.close()
+
+    def run(self, name: str, args: list[str]) -> Timings:
+        sample = SAMPLES[name]
+        timings = Timings()
+
+        client = None
+        if sample.client is not None:
+            client = self._client(sample.client, timings)
+
+        started_at = time.perf_counter()
+        module = self._import(sample.path)
+        entrypoint = getattr(module, sample.entrypoint)
+        timings.imports += time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        try:
+            if sample.entrypoint == "main":
+                kwargs = {"gladia_client": client} if client is not None else {}
+                result = entrypoint(args, **kwargs)
+            else:
+                result = entrypoint(client, *args)
+            if inspect.isawaitable(result):
+                self._loop.run_until_complete(result)
+        finally:
+            timings.run = time.perf_counter() - started_at
+        return timings
+
+    def _client(self, kind: str, timings: Timings) -> Any:
+        if kind not in self._clients:
+            if self._gladia_client is None:
+                started_at = time.perf_counter()
+                from gladiaio_sdk import GladiaClient
+
+                timings.imports += time.perf_counter() - started_at
+
+                started_at = time.perf_counter()
+                # Create your account and get your API key in 30 seconds at https://docs.gladia.io/chapters/introduction/getting-started
+                self._gladia_client = GladiaClient(
+                    api_key=os.getenv("GLADIA_API_KEY", "GLADIA_API_KEY")
+                )
+                timings.client += time.perf_counter() - started_at
+
+            started_at = time.perf_counter()
+            self._clients[kind] = getattr(self._gladia_client, kind)()
+            timings.client += time.perf_counter() - started_at
+        return self._clients[kind]
+
+    def _import(self, path: str) -> ModuleType:
+        if path not in self._modules:
+            file = SAMPLES_DIR / path
+            # Registered under its file name, and importable from its folder, so that child
+            # processes started with the "spawn" method can import it again
+            name = file.stem.replace("-", "_")
+            sys.path.insert(0, str(file.parent))
+            spec = importlib.util.spec_from_file_location(name, file)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[name] = module
+            spec.loader.exec_module(module)
+            self._modules[path] = module
+        return self._modules[path]
+
+
+def print_timings(name: str, timings: Timings) -> None:
+    print(
+        f"[gladia-samples] {name}: imports {timings.imports * 1000:.0f} ms, "
+        f"client {timings.client * 1000:.0f} ms, run {timings.run:.2f} s",
+        file=sys.stderr,
+    )
+
+
+def serve(runner: Runner) -> None:
+    """Run one sample per line of stdin until it is closed."""
+    for line in sys.stdin:
+        words = shlex.split(line, comments=True)
+        if not words:
+            continue
+        name, args = words[0], words[1:]
+        if name not in SAMPLES:
+            print(f"[gladia-samples] unknown sample {name!r}", file=sys.stderr)
+            continue
+        try:
+            timings = runner.run(name, args)
+        except SystemExit:
+            # Raised by argparse on invalid arguments, which it already reported
+            continue
+        except Exception:
+            traceback.print_exc()
+            continue
+        print_timings(name, timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="gladia-samples", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List the samples")
+    run_parser = commands.add_parser("run", help="Run one sample")
+    run_parser.add_argument("name", choices=SAMPLES, metavar="name")
+    run_parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments of the sample")
+    commands.add_parser("serve", help="Run the samples read from stdin, one per line")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name, sample in SAMPLES.items():
+            print(f"{name:<24} {sample.path}")
+        return
+
+    runner = Runner()
+    try:
+        if args.command == "run":
+            print_timings(args.name, runner.run(args.name, args.args))
+        else:
+            serve(runner)
+    finally:
+        runner.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ echo "Checking sample layout under $ROOT ..."
 # --- Python (README + pyproject [tool.gladia.scripts]) ---
 require_path "python/README.md"
 require_path "python/pyproject.toml"
+require_path "python/gladia_samples.py"
 require_path "python/core-concepts/pre-recorded/pre_recorded.py"
 require_path "python/core-concepts/pre-recorded/pre_recorded_async.py"
 require_path "python/core-concepts/live/live-from-file.py"
@@ -28,6 +29,12 @@ require_path "python/examples/anonymized_call.py"
 require_path "python/examples/call_sentiment_analysis.py"
 require_path "python/examples/meeting_summary.py"
 require_path "python/examples/youtube_translation.py"
+require_path "python/examples/long_file_transcription.py"
+require_path "python/examples/durable_job_queue.py"
+require_path "python/examples/traced_transcription.py"
+require_path "python/examples/live_soak_test.py"
+require_path "python/examples/compact_results.py"
+require_path "python/examples/live_keyword_alerts.py"
 
 # --- JavaScript (README + package.json scripts) ---
 require_path "javascript/README.md"